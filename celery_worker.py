@@ -1,5 +1,16 @@
 """Celery worker configuration."""
 
+# Patch blocking I/O for the gevent pool before anything opens a socket
+from gevent import monkey
+
+monkey.patch_all()
+
+# Configure logging before importing modules that log at import time. Log
+# sinks can't use a background queue once gevent has patched threading.
+from src.core.logging import setup_logging
+
+setup_logging(enqueue=False)
+
 from types import TracebackType
 from typing import Any
 
@@ -20,7 +31,6 @@ from loguru import logger  # type: ignore
 # Even though it appears unused, this import is necessary
 import src.tasks.pipeline  # noqa
 from src.core.celery_app import celery_app
-from src.core.logging import setup_logging
 
 # Export the Celery app instance
 celery = celery_app
@@ -45,7 +55,7 @@ def task_received_handler(
 ) -> None:
     """Log when task is received."""
     if request:
-        logger.info(f"Task received: {request.task}[{request.id}]")
+        logger.info("Task received: {}[{}]", request.task, request.id)
 
 
 @task_prerun.connect
@@ -56,14 +66,16 @@ def task_prerun_handler(
 ) -> None:
     """Log before task execution."""
     if task_id and task:
-        logger.info(f"Starting task: {task.name}[{task_id}]")
+        logger.info("Starting task: {}[{}]", task.name, task_id)
 
 
 @task_success.connect
 def task_success_handler(sender: Task | None = None, **_kwargs: dict[str, Any]) -> None:
     """Log successful task completion."""
     if sender and sender.request and sender.request.id:
-        logger.info(f"Task completed successfully: {sender.name}[{sender.request.id}]")
+        logger.info(
+            "Task completed successfully: {}[{}]", sender.name, sender.request.id
+        )
 
 
 @task_failure.connect
@@ -76,11 +88,11 @@ def task_failure_handler(
 ) -> None:
     """Log task failure."""
     if task_id and sender:
-        logger.error(f"Task failed: {sender.name}[{task_id}]")
+        logger.error("Task failed: {}[{}]", sender.name, task_id)
         if exception:
-            logger.error(f"Error: {exception}")
+            logger.error("Error: {}", exception)
         if traceback:
-            logger.error(f"Traceback: {traceback}")
+            logger.error("Traceback: {}", traceback)
 
 
 @task_revoked.connect
@@ -93,13 +105,13 @@ def task_revoked_handler(
     """Log when task is revoked."""
     if request:
         logger.warning(
-            f"Task revoked: {request.task}[{request.id}] "
-            f"(terminated: {terminated}, signal: {signum})"
+            "Task revoked: {}[{}] (terminated: {}, signal: {})",
+            request.task,
+            request.id,
+            terminated,
+            signum,
         )
 
 
-# Configure logging before starting worker
-setup_logging()
-
 if __name__ == "__main__":
     celery_app.start()
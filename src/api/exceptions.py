@@ -15,22 +15,12 @@ class APIError(Exception):
         super().__init__(message)
 
 
-class InvalidFormatError(APIError):
-    """Error for invalid file format."""
-
-    def __init__(self) -> None:
-        super().__init__(
-            "Upload requires JSON or YAML file",
-            status.HTTP_400_BAD_REQUEST,
-        )
-
-
 class UploadError(APIError):
     """Error during file upload processing."""
 
     def __init__(self) -> None:
         super().__init__(
-            "Task chain started but no task ID was returned",
+            "Processing task started but no task ID was returned",
             status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
@@ -59,7 +49,7 @@ def handle_upload_error(e: Exception, job_id: str | None = None) -> NoReturn:
 
     # Unexpected error
     error_msg = "Failed to process spec"
-    logger.error(f"Error in task chain setup: {e}", exc_info=True)
+    logger.error(f"Error in processing task setup: {e}", exc_info=True)
     if job_id:
         state_store.set_failure(job_id, error_msg)
     raise HTTPException(
@@ -1,37 +1,46 @@
 from typing import Any
 
 from fastapi import HTTPException, UploadFile, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.core.models import TaskState
+from src.core.storage import SpecFormat
 
-CONTENT_TYPES = [
-    "application/json",
-    "text/yaml",
-    "application/x-yaml",
-    "text/plain",
-    "text/x-yaml",
-]
+# Supported upload content types and the spec format each one implies
+SPEC_FORMATS: dict[str, SpecFormat] = {
+    "application/json": SpecFormat.JSON,
+    "text/yaml": SpecFormat.YAML,
+    "application/x-yaml": SpecFormat.YAML,
+    "text/plain": SpecFormat.YAML,
+    "text/x-yaml": SpecFormat.YAML,
+}
 
 
-def validate_spec_file(file: UploadFile) -> None:
+def validate_spec_file(file: UploadFile) -> SpecFormat:
     """
     Validate an uploaded OpenAPI spec file.
 
     Args:
         file: The uploaded file to validate
 
+    Returns:
+        SpecFormat: The spec format implied by the file's content type
+
     Raises:
         HTTPException: If the file type is not supported
     """
-    if file.content_type not in CONTENT_TYPES:
+    spec_format = SPEC_FORMATS.get(file.content_type or "")
+    if spec_format is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unsupported file type. Please upload a JSON or YAML file.",
         )
+    return spec_format
 
 
 class SummaryResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     status: TaskState
     current_job_name: str | None = None
     current_job_progress: float | None = None
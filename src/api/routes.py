@@ -1,49 +1,169 @@
 """API routes for the application."""
 
-from typing import Any
-from uuid import uuid4
-
-from fastapi import APIRouter, HTTPException, Response, UploadFile, status
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+import asyncio
+import hashlib
+import io
+import os
+import random
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Annotated, Any, BinaryIO
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse
 from loguru import logger
 
-from src.api.exceptions import (
-    InvalidFormatError,
-    handle_upload_error,
-)
+from src.api.exceptions import handle_upload_error
 from src.api.models import SummaryResponse, validate_spec_file
 from src.core.celery_app import celery_app
 from src.core.health import check_celery_worker, check_redis_connection
-from src.core.models import TaskState
+from src.core.models import TaskState, TaskStatus
 from src.core.state import state_store
-from src.core.storage import ExportFormat, JobStorage, SpecFormat
-from src.tasks.pipeline import create_processing_chain
+from src.core.storage import (
+    EXPORT_MEDIA_TYPES,
+    ExportFormat,
+    SpecFormat,
+    job_storage,
+    new_job_id,
+)
+from src.tasks.pipeline import process_spec_pipeline
 from src.tasks.standalone import verify_broker_connection
 
 router = APIRouter(prefix="/api", tags=["api"])
 
+# Health results are reused for a second or so, so that frequent probes don't
+# each hit Redis and the broker. The jitter keeps API instances from
+# refreshing in lockstep.
+HEALTH_CACHE_TTL = 1.0
+HEALTH_CACHE_JITTER = 0.5
+# (expires_at, status_code, content) of the last health check, if any
+_health_cache: tuple[float, int, dict[str, Any]] | None = None
+
+# Job states are reused briefly so polling clients don't each hit Redis. A
+# successful job doesn't change again, so its state is kept much longer, but
+# still re-read now and then in case the job has expired or been deleted;
+# failed jobs may still be retried, so they follow the short TTL.
+STATE_CACHE_TTL = 0.5
+SUCCESS_STATE_CACHE_TTL = 300.0
+STATE_CACHE_SIZE = 4096
+_state_cache: OrderedDict[str, tuple[float, TaskStatus]] = OrderedDict()
+_state_fetches: dict[str, asyncio.Future[TaskStatus | None]] = {}
+
+# Export locations by job and format. Lookups run in threadpool workers, so
+# the cache is guarded by a lock.
+EXPORT_PATH_CACHE_SIZE = 1024
+_export_paths: OrderedDict[tuple[str, ExportFormat], Path] = OrderedDict()
+_export_paths_lock = threading.Lock()
+
+
+@dataclass
+class JobContext:
+    """State of a job, fetched once per request."""
+
+    job_id: str
+    state: TaskStatus
+
+
+def _get_cached_state(job_id: str) -> TaskStatus | None:
+    """Get the cached state of a job if it is still fresh."""
+    cached = _state_cache.get(job_id)
+    if not cached:
+        return None
+
+    fetched_at, state = cached
+    ttl = (
+        SUCCESS_STATE_CACHE_TTL if state.state == TaskState.SUCCESS else STATE_CACHE_TTL
+    )
+    if time.monotonic() - fetched_at >= ttl:
+        return None
+
+    _state_cache.move_to_end(job_id)
+    return state
+
+
+async def _fetch_state(job_id: str) -> TaskStatus | None:
+    """Read the state of a job from the state store and cache it."""
+    state = await run_in_threadpool(state_store.get_state, job_id)
+    if state is None:
+        _state_cache.pop(job_id, None)
+        return None
+
+    # Stamp after the read so the TTL counts from when the data was current
+    _state_cache[job_id] = (time.monotonic(), state)
+    _state_cache.move_to_end(job_id)
+    if len(_state_cache) > STATE_CACHE_SIZE:
+        _state_cache.popitem(last=False)
+    return state
+
+
+async def _get_state(job_id: str) -> TaskStatus | None:
+    """Get the state of a job, sharing one in-flight read per job.
+
+    Concurrent polls for the same job that miss the cache wait on a single
+    state store read instead of each issuing their own.
+    """
+    if state := _get_cached_state(job_id):
+        return state
+
+    fetch = _state_fetches.get(job_id)
+    if fetch is None:
+        fetch = asyncio.ensure_future(_fetch_state(job_id))
+        _state_fetches[job_id] = fetch
+        fetch.add_done_callback(lambda _: _state_fetches.pop(job_id, None))
+
+    # Shield the shared read so one cancelled request doesn't cancel it for all
+    return await asyncio.shield(fetch)
 
-def _detect_format(content_type: str | None) -> SpecFormat:
-    """Detect file format from content type."""
-    if content_type is None:
-        raise InvalidFormatError()
-    return SpecFormat.JSON if "json" in content_type else SpecFormat.YAML
+
+async def get_job_context(job_id: str) -> JobContext:
+    """Load the job state, raising 404 if the job is unknown."""
+    state = await _get_state(job_id)
+    logger.debug("[{}] State: {}", job_id, state)
+
+    if not state:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return JobContext(job_id=job_id, state=state)
+
+
+JobContextDep = Annotated[JobContext, Depends(get_job_context)]
 
 
 @router.get("/health")
-async def health_check() -> JSONResponse:
+async def health_check() -> ORJSONResponse:
     """Check health of service dependencies."""
-    redis_result = check_redis_connection()
-    celery_result = check_celery_worker(celery_app)
-
-    service_status = (
-        "healthy"
-        if redis_result.is_healthy and celery_result.is_healthy
-        else "unhealthy"
+    global _health_cache  # noqa: PLW0603
+    if _health_cache and _health_cache[0] > time.monotonic():
+        _, status_code, response_content = _health_cache
+        return ORJSONResponse(status_code=status_code, content=response_content)
+
+    # Both checks block on network round-trips, the worker ping for its full
+    # timeout, so run them in the threadpool side by side
+    redis_result, celery_result = await asyncio.gather(
+        run_in_threadpool(check_redis_connection),
+        run_in_threadpool(check_celery_worker, celery_app),
     )
+    is_healthy = redis_result.is_healthy and celery_result.is_healthy
 
     response_content = {
-        "status": service_status,
+        "status": "healthy" if is_healthy else "unhealthy",
         "redis": {
             "healthy": redis_result.is_healthy,
             **redis_result.details,
@@ -53,14 +173,35 @@ async def health_check() -> JSONResponse:
             **celery_result.details,
         },
     }
+    status_code = (
+        status.HTTP_200_OK if is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+    ttl = HEALTH_CACHE_TTL + random.random() * HEALTH_CACHE_JITTER  # noqa: S311
+    _health_cache = (time.monotonic() + ttl, status_code, response_content)
+    return ORJSONResponse(status_code=status_code, content=response_content)
+
+
+def _start_processing(job_id: str) -> str:
+    """Queue the processing pipeline for a job and record its task ID."""
+    verify_broker_connection(process_spec_pipeline)
+    result = process_spec_pipeline.apply_async(args=[job_id])
+    state_store.set_task_id(job_id, result.id)
+    return result.id
+
+
+def _job_urls(job_id: str) -> dict[str, str]:
+    """Canonical URLs clients should poll for a job."""
+    return {
+        "state_url": router.url_path_for("get_job_state", job_id=job_id),
+        "summary_url": router.url_path_for("get_summary", job_id=job_id),
+        "export_url": router.url_path_for("export_summary", job_id=job_id),
+    }
 
-    if not redis_result.is_healthy or not celery_result.is_healthy:
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content=response_content,
-        )
 
-    return JSONResponse(content=response_content)
+def _save_upload(job_id: str, file: BinaryIO, spec_format: SpecFormat) -> None:
+    """Save an uploaded spec to a new job's storage."""
+    job_storage(job_id).save_spec_file(file, spec_format)
 
 
 @router.post("/spec/upload")
@@ -68,60 +209,54 @@ async def upload_spec(file: UploadFile) -> dict[str, str]:
     """Upload an OpenAPI spec (YAML or JSON) and start processing pipeline."""
     job_id = None
     try:
-        # Validate and read file
-        validate_spec_file(file)
-        content = await file.read()
+        # Validate file
+        spec_format = validate_spec_file(file)
+        job_id = new_job_id()
 
-        # Process spec
-        spec_content = content.decode("utf-8")
-        job_id = str(uuid4())
+        # Set up the job directory and stream the spec to disk in a worker
+        # thread so neither blocks the event loop
+        await run_in_threadpool(_save_upload, job_id, file.file, spec_format)
 
-        # Save spec
-        storage = JobStorage(job_id)
-        storage.save_spec(spec_content, _detect_format(file.content_type))
+        # Verify broker and start task; publishing is blocking broker I/O
+        task_id = await run_in_threadpool(_start_processing, job_id)
 
-        # Create and verify chain
-        chain = create_processing_chain(spec_content, job_id)
-        verify_broker_connection(chain)
-
-        # Start task and store ID
-        result = chain.apply_async()
-        state_store.set_task_id(job_id, result.id)
-
-    except (InvalidFormatError, HTTPException) as e:
+    except HTTPException:
         # Re-raise HTTP exceptions directly
-        if isinstance(e, HTTPException):
-            raise
-        # Convert InvalidFormatError to HTTPException
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        ) from e
+        raise
     except Exception as e:
         raise handle_upload_error(e, job_id) from e
 
     else:
         # Log and return
-        logger.info(f"[{job_id}] Started task chain: {result.id}")
-        return {"job_id": job_id}
+        logger.info("[{}] Started processing task: {}", job_id, task_id)
+        return {"job_id": job_id, **_job_urls(job_id)}
 
 
-@router.get("/spec/{job_id}/summary")
-async def get_summary(job_id: str) -> JSONResponse:
-    """Retrieve a plain-English summary of the spec"""
-    storage = JobStorage(job_id)
+def _save_summary_if_missing(job_id: str, summary: dict[str, Any]) -> None:
+    """Save a job's summary to storage unless it is already there."""
+    storage = job_storage(job_id)
+    if not storage.get_summary_path():
+        logger.info("Saving {} summary", job_id)
+        storage.save_summary(summary)
 
-    # Check task state first
-    state = state_store.get_state(job_id)
 
-    logger.debug(f"[{job_id}] State: {state}")
+def _state_cache_headers(state: TaskStatus) -> dict[str, str]:
+    """Build caching headers for a response derived from a job's state.
+
+    The ETag changes whenever the state store updates the job. Successful
+    jobs don't change again, so clients may also cache them outright.
+    """
+    key = f"{state.job_id}:{state.state.value}:{state.updated_at.isoformat()}"
+    headers = {"ETag": f'"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'}
+    if state.state == TaskState.SUCCESS:
+        headers["Cache-Control"] = "public, max-age=3600, immutable"
+    return headers
 
-    if not state:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found",
-        )
 
+@router.get("/spec/{job_id}/summary")
+async def get_summary(job: JobContextDep, request: Request) -> Response:
+    """Retrieve a plain-English summary of the spec"""
+    state = job.state
     if state.state == TaskState.FAILURE:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -129,62 +264,71 @@ async def get_summary(job_id: str) -> JSONResponse:
         )
 
     # Not failure
-    response = SummaryResponse(
-        status=state.state.value,
-        current_job_name=state.progress[-1].stage if state.progress else None,
-        current_job_progress=state.progress[-1].progress if state.progress else None,
-    )
+    latest_progress = state.progress[-1] if state.progress else None
+    current_job_name = latest_progress.stage if latest_progress else None
+    current_job_progress = latest_progress.progress if latest_progress else None
 
     # Return state from our store
     if state.state != TaskState.SUCCESS:
-        return JSONResponse(
+        response = SummaryResponse(
+            status=state.state,
+            current_job_name=current_job_name,
+            current_job_progress=current_job_progress,
+        )
+        return Response(
             status_code=status.HTTP_202_ACCEPTED,
-            content=response.model_dump(),
+            content=response.model_dump_json(),
+            media_type="application/json",
         )
 
     # Success
-    # Save the summary if we haven't already
-    if not storage.get_summary_path() and state.result:
-        logger.info(f"Saving {job_id} summary")
-        storage.save_summary(state.result)
+    headers = _state_cache_headers(state)
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Save the summary if we haven't already; the job directory is only
+    # touched once the job is done
+    if state.result:
+        await run_in_threadpool(_save_summary_if_missing, job.job_id, state.result)
 
-    response.result = state.result
-    return JSONResponse(content=response.model_dump())
+    response = SummaryResponse(
+        status=state.state,
+        current_job_name=current_job_name,
+        current_job_progress=current_job_progress,
+        result=state.result,
+    )
+    return Response(
+        content=response.model_dump_json(),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @router.get("/spec/{job_id}/state")
-async def get_job_state(job_id: str) -> JSONResponse:
+async def get_job_state(job: JobContextDep, request: Request) -> Response:
     """Get the current state of a job.
 
     Args:
-        job_id: Unique job identifier
+        job: Job context for the requested job ID
+        request: Incoming request, checked for a matching ETag
 
     Returns:
-        JSONResponse: Current job state and progress
+        Response: Current job state and progress, or 304 if unchanged
     """
-    # Check task state
-    state = state_store.get_state(job_id)
-    if not state:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Job not found",
-        )
+    state = job.state
+    headers = _state_cache_headers(state)
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
     # Return state from our store
     response: dict[str, Any] = {
         "status": state.state.value,
-        "created_at": state.created_at.isoformat(),
-        "updated_at": state.updated_at.isoformat(),
+        "created_at": state.created_at,
+        "updated_at": state.updated_at,
     }
 
     if state.progress:
-        latest_progress = state.progress[-1]
-        response["progress"] = {
-            "stage": latest_progress.stage,
-            "percentage": latest_progress.progress,
-            "message": latest_progress.message,
-            "timestamp": latest_progress.timestamp.isoformat(),
-        }
+        response["progress"] = state.progress[-1].response_data
 
     if state.state == TaskState.FAILURE:
         response["error"] = state.error if state.error else "Unknown error"
@@ -192,16 +336,38 @@ async def get_job_state(job_id: str) -> JSONResponse:
     if state.state == TaskState.SUCCESS and state.result:
         response["result"] = state.result
 
-    return JSONResponse(content=response)
+    return ORJSONResponse(content=response, headers=headers)
 
 
-@router.get("/spec/{job_id}/export", response_model=None)
-async def export_summary(
-    job_id: str,
-    file_format: ExportFormat = ExportFormat.MARKDOWN,
-) -> Response:
-    """Export the summary in various formats"""
-    storage = JobStorage(job_id)
+@lru_cache(maxsize=1024)
+def _export_etag(path: Path, _mtime_ns: int) -> str:
+    """Compute the ETag of an export file.
+
+    The modification time is part of the cache key, so a rewritten export
+    is hashed again.
+    """
+    with path.open("rb") as f:
+        digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16))
+    return f'"{digest.hexdigest()}"'
+
+
+def _export_path(job_id: str, file_format: ExportFormat) -> Path:
+    """Locate a job's export, creating it if needed.
+
+    An export stays at the same path once it exists, so the location is
+    cached. Errors aren't cached, so a job whose summary isn't ready is
+    checked again on the next request.
+
+    Raises:
+        HTTPException: If the job is unknown or its summary isn't ready
+    """
+    key = (job_id, file_format)
+    with _export_paths_lock:
+        if path := _export_paths.get(key):
+            _export_paths.move_to_end(key)
+            return path
+
+    storage = job_storage(job_id)
 
     # Check if the job exists and has a summary
     if not storage.get_summary_path():
@@ -216,17 +382,109 @@ async def export_summary(
             detail="Job not found",
         )
 
-    # Get the export content and media type
-    content, media_type = storage.get_export_content(file_format)
-
-    # Return appropriate response based on content type
-    if file_format == ExportFormat.HTML:
-        return HTMLResponse(content=content)
-    if file_format == ExportFormat.DOCX:
-        return FileResponse(
-            path=storage.ensure_export_exists(file_format),
-            media_type=media_type,
-            filename=f"api_summary.{file_format}",
+    path = storage.ensure_export_exists(file_format)
+    with _export_paths_lock:
+        _export_paths[key] = path
+        if len(_export_paths) > EXPORT_PATH_CACHE_SIZE:
+            _export_paths.popitem(last=False)
+    return path
+
+
+def _stat_export(job_id: str, file_format: ExportFormat) -> tuple[Path, os.stat_result]:
+    """Locate a job's export and stat it.
+
+    Raises:
+        HTTPException: If the job is unknown or its summary isn't ready
+    """
+    path = _export_path(job_id, file_format)
+    try:
+        stat_result = path.stat()
+    except FileNotFoundError:
+        # The job's data was deleted since the path was cached
+        with _export_paths_lock:
+            _export_paths.pop((job_id, file_format), None)
+        path = _export_path(job_id, file_format)
+        stat_result = path.stat()
+    return path, stat_result
+
+
+def _prepare_export(
+    job_id: str, file_format: ExportFormat
+) -> tuple[Path, os.stat_result, str]:
+    """Locate a job's export and compute its ETag.
+
+    Returns:
+        A tuple of (path, stat_result, etag)
+
+    Raises:
+        HTTPException: If the job is unknown or its summary isn't ready
+    """
+    path, stat_result = _stat_export(job_id, file_format)
+    return path, stat_result, _export_etag(path, stat_result.st_mtime_ns)
+
+
+@router.get("/spec/{job_id}/export", response_model=None)
+async def export_summary(
+    job: JobContextDep,
+    request: Request,
+    file_format: ExportFormat = ExportFormat.MARKDOWN,
+) -> Response:
+    """Export the summary in various formats"""
+    # Locating, creating and hashing the export is filesystem I/O
+    path, stat_result, etag = await run_in_threadpool(
+        _prepare_export, job.job_id, file_format
+    )
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    # Stream the file rather than reading it into memory in the handler
+    return FileResponse(
+        path,
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers={"ETag": etag},
+        filename=(
+            f"api_summary.{file_format.value}"
+            if file_format == ExportFormat.DOCX
+            else None
+        ),
+        stat_result=stat_result,
+    )
+
+
+def _zip_exports(paths: dict[ExportFormat, Path]) -> bytes:
+    """Bundle export files into a ZIP archive."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for file_format, path in paths.items():
+            archive.write(path, f"api_summary.{file_format.value}")
+    return buffer.getvalue()
+
+
+@router.get("/spec/{job_id}/export_all", response_model=None)
+async def export_all(
+    job: JobContextDep,
+    formats: Annotated[list[ExportFormat] | None, Query()] = None,
+) -> Response:
+    """Export the summary in several formats as one ZIP archive"""
+    requested = list(dict.fromkeys(formats or ExportFormat))
+
+    # Each format is generated independently, so build them concurrently
+    exports = await asyncio.gather(
+        *(
+            run_in_threadpool(_stat_export, job.job_id, file_format)
+            for file_format in requested
         )
-    # MARKDOWN
-    return Response(content=content, media_type=media_type)
+    )
+    paths = {
+        file_format: path
+        for file_format, (path, _) in zip(requested, exports, strict=True)
+    }
+    content = await run_in_threadpool(_zip_exports, paths)
+    return Response(
+        content=content,
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="api_summary.zip"'},
+    )
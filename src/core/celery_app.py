@@ -19,22 +19,50 @@ celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
+    # Job state and results are kept in the state store, and nothing reads
+    # the Celery result backend, so don't write task results to it
+    task_ignore_result=True,
     # Time settings
     timezone="UTC",
     enable_utc=True,
     # Task tracking settings
     task_track_started=True,
     task_track_received=True,
-    task_send_sent_event=True,
+    # Event settings. Job state lives in the state store and health checks use
+    # remote control, so task events only add broker traffic. The tradeoff is
+    # that event-based monitors such as Flower see nothing. Workers are also
+    # started with --without-gossip --without-mingle --without-heartbeat.
+    task_send_sent_event=False,
+    worker_send_task_events=False,
     # Worker settings
+    worker_pool="gevent",  # Tasks are I/O-bound (Redis, LLM API, file reads)
+    worker_concurrency=100,  # Greenlets per worker process
+    worker_prefetch_multiplier=1,  # Reserve one task at a time per slot
+    task_acks_late=True,  # Ack after the task finishes, not on receipt
+    task_reject_on_worker_lost=True,  # Requeue tasks from a killed worker
+    # Runaway tasks are stopped well before the broker would redeliver them
+    task_soft_time_limit=30 * 60,
+    task_time_limit=30 * 60 + 100,
+    broker_transport_options={
+        # Unacked tasks are redelivered after this long; it must exceed the
+        # longest task or acks_late tasks get run twice
+        "visibility_timeout": 2 * 60 * 60,
+    },
     worker_redirect_stdouts=False,  # Don't redirect stdout/stderr
     worker_redirect_stdouts_level="INFO",
     # Task discovery settings
-    imports=("src.tasks.pipeline",),  # Explicitly import tasks module
+    imports=(  # Explicitly import tasks modules
+        "src.tasks.pipeline",
+        "src.tasks.maintenance",
+    ),
     task_default_queue="api_introspection",  # Default queue for tasks
     task_default_exchange="api_introspection",  # Default exchange for tasks
     task_default_routing_key="api_introspection",  # Default routing key
+    # Beat settings
+    beat_schedule={
+        "cleanup-expired-jobs": {
+            "task": "src.tasks.maintenance.cleanup_expired_jobs",
+            "schedule": 60 * 60,  # Hourly
+        },
+    },
 )
-
-# Import tasks module to ensure tasks are registered
-import src.tasks.pipeline  # noqa
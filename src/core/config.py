@@ -1,10 +1,9 @@
+from functools import cached_property, lru_cache
 from pathlib import Path
 
-from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-
-load_dotenv()
+from redis import BlockingConnectionPool
 
 JOB_DATA_ROOT = Path("results")
 
@@ -24,11 +23,29 @@ class Settings(BaseSettings):
     )
     S3_BUCKET_NAME: str | None = Field(default=None, validation_alias="S3_BUCKET_NAME")
     JOB_DATA_DIR: str = Field(default="results", validation_alias="JOB_DATA_DIR")
+    JOB_RETENTION_DAYS: int = Field(default=7, validation_alias="JOB_RETENTION_DAYS")
 
-    @property
+    @cached_property
     def job_data_path(self) -> Path:
         """Get the job data directory path."""
         return Path(self.JOB_DATA_DIR)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, reading the environment only once."""
+    return Settings()
+
+
+settings = get_settings()
+
+# Connection pool shared by the application's Redis clients. Clients wait for
+# a free connection rather than failing when all of them are in use.
+redis_pool = BlockingConnectionPool.from_url(
+    settings.REDIS_URL,
+    max_connections=32,
+    timeout=5,
+    socket_connect_timeout=2,
+    socket_keepalive=True,
+    health_check_interval=30,
+)
@@ -3,6 +3,7 @@
 import logging
 import sys
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 from loguru import logger  # type: ignore
@@ -10,6 +11,15 @@ from loguru import logger  # type: ignore
 from .config import LogConfig
 from .handlers import InterceptHandler, get_caller_info
 
+# IDs of the handlers added by setup_logging, empty until it has run
+_handler_ids: list[int] = []
+
+
+@lru_cache(maxsize=256)
+def _bound_logger(name: str) -> Any:  # noqa: ANN401
+    """Get a logger bound to a context name, reusing it for repeat calls."""
+    return logger.bind(context=name)
+
 
 def get_logger(name: str | None = None) -> Any:  # noqa: ANN401
     """Get a logger instance.
@@ -24,27 +34,41 @@ def get_logger(name: str | None = None) -> Any:  # noqa: ANN401
         filename, function_name, line_number = get_caller_info()
         name = f"{filename}:{function_name}:{line_number}"
 
-    return logger.bind(context=name)
+    return _bound_logger(name)
 
 
-def setup_logging(config: LogConfig | None = None) -> None:
+def setup_logging(
+    config: LogConfig | None = None, *, force: bool = False, enqueue: bool = True
+) -> None:
     """Set up logging configuration.
 
+    Only the first call configures logging, so entry points can call this
+    without adding duplicate handlers or opening extra log files.
+
     Args:
         config: Optional logging configuration. If None, uses defaults.
+        force: Reconfigure logging even if it has already been set up.
+        enqueue: Write the log file from a background queue. Must be False
+            under gevent's monkey patching, where the queue's reader thread
+            becomes a greenlet that blocks the hub on its pipe read.
     """
+    if _handler_ids and not force:
+        return
+
     if config is None:
         config = LogConfig()
 
-    # Remove default handler
+    # Remove default and previously added handlers
     logger.remove()
+    _handler_ids.clear()
 
-    # Add console handler
-    logger.add(
+    # Add console handler. Writes to stderr are cheap and already serialized
+    # by loguru, so only the file sink gets a background queue and thread.
+    console_id = logger.add(
         sys.stderr,
         format=config.console_format,
         level=config.level,
-        enqueue=True,
+        enqueue=False,
         diagnose=True,
         backtrace=True,
     )
@@ -53,22 +77,25 @@ def setup_logging(config: LogConfig | None = None) -> None:
     now = datetime.now(timezone.utc)
     log_file = config.log_dir / f"api_{now.strftime('%Y%m%d_%H%M%S')}.log"
 
-    # Ensure we have a valid format string
-    file_format = (
-        config.file_format if config.file_format is not None else config.console_format
-    )
-
-    logger.add(
+    file_id = logger.add(
         str(log_file),
-        format=file_format,
+        format=config.file_format,  # Defaulted by LogConfig.__post_init__
         level=config.level,
         rotation=config.rotation_interval,
         retention=f"{config.retention_days} days",
         compression="zip",
-        enqueue=True,
+        enqueue=enqueue,
         diagnose=True,
         backtrace=True,
     )
 
-    # Configure standard library logging to use loguru
-    logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+    _handler_ids.extend((console_id, file_id))
+
+    # Configure standard library logging to use loguru. Loguru's levels share
+    # the standard numbering, so records below the configured level are
+    # dropped before they are created rather than in the handler.
+    logging.basicConfig(
+        handlers=[InterceptHandler()],
+        level=logger.level(config.level).no,
+        force=True,
+    )
@@ -2,10 +2,16 @@
 
 import inspect
 import logging
+from functools import lru_cache
 from types import FrameType
 
 from loguru import logger
 
+# Taken from a logging code object rather than logging.__file__: code objects
+# of one module share a filename string, so comparisons against it in the
+# frame walk succeed on identity instead of comparing paths
+_LOGGING_FILE = logging.Logger.handle.__code__.co_filename
+
 
 def get_caller_info() -> tuple[str, str, int]:
     """Get information about the calling frame.
@@ -22,13 +28,18 @@ def get_caller_info() -> tuple[str, str, int]:
     if caller_frame is None:
         return "unknown", "unknown", 0
 
-    # Extract information
-    frame_info = inspect.getframeinfo(caller_frame)
-    return (
-        frame_info.filename,
-        frame_info.function,
-        frame_info.lineno if frame_info.lineno is not None else 0,
-    )
+    # Read the frame directly; getframeinfo would also load source lines
+    code = caller_frame.f_code
+    return code.co_filename, code.co_name, caller_frame.f_lineno or 0
+
+
+@lru_cache(maxsize=64)
+def _loguru_level(levelname: str, levelno: int) -> str:
+    """Get the Loguru level matching a standard library level."""
+    try:
+        return logger.level(levelname).name
+    except ValueError:
+        return str(levelno)
 
 
 class InterceptHandler(logging.Handler):
@@ -40,15 +51,11 @@ class InterceptHandler(logging.Handler):
         Args:
             record: The log record to emit
         """
-        # Get corresponding Loguru level if it exists
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = str(record.levelno)
+        level = _loguru_level(record.levelname, record.levelno)
 
         # Find caller from where originated the logged message
         frame, depth = inspect.currentframe(), 0
-        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+        while frame and (depth == 0 or frame.f_code.co_filename == _LOGGING_FILE):
             frame = frame.f_back
             depth += 1
 
@@ -2,34 +2,10 @@
 
 from datetime import datetime, timezone
 from enum import Enum
+from functools import cached_property
 from typing import Any
 
-from pydantic import BaseModel, Field, model_serializer
-
-
-class DateTimeSerializerMixin(BaseModel):
-    """Mixin to handle datetime ISO format serialization."""
-
-    @model_serializer
-    def serialize_model(self) -> dict[str, Any]:
-        """Serialize the model, converting all datetime fields to ISO format."""
-        data: dict[str, Any] = {}
-        for field_name, field_value in self:
-            if isinstance(field_value, datetime):
-                data[field_name] = field_value.isoformat()
-            elif (
-                isinstance(field_value, list)
-                and field_value
-                and isinstance(field_value[0], BaseModel)
-            ):
-                data[field_name] = [
-                    dict(item.model_dump(mode="json")) for item in field_value
-                ]
-            elif isinstance(field_value, Enum):
-                data[field_name] = field_value.value
-            elif field_value is not None:
-                data[field_name] = field_value
-        return data
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class TaskState(str, Enum):
@@ -46,14 +22,40 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-class ProgressUpdate(DateTimeSerializerMixin):
+def _created_at(data: dict[str, Any]) -> datetime:
+    """Default a new status's update time to its creation time."""
+    return data["created_at"]
+
+
+class ProgressUpdate(BaseModel):
     """Task progress update."""
 
+    # Updates are never modified once recorded, which keeps cached values valid
+    model_config = ConfigDict(frozen=True)
+
     stage: str = Field(..., description="Current processing stage")
     progress: float = Field(..., ge=0, le=100, description="Progress percentage")
     message: str | None = Field(default=None, description="Progress message")
     timestamp: datetime = Field(default_factory=_utc_now)
 
+    @cached_property
+    def response_data(self) -> dict[str, Any]:
+        """Progress as reported by the state endpoint, built once per update.
+
+        The dict is reused by every poll that sees this update.
+        """
+        return {
+            "stage": self.stage,
+            "percentage": self.progress,
+            "message": self.message,
+            "timestamp": self.timestamp,
+        }
+
+    @cached_property
+    def iso_timestamp(self) -> str:
+        """Timestamp in ISO format, formatted once per update."""
+        return self.timestamp.isoformat()
+
     def __str__(self) -> str:
         """Return a string representation of the progress update."""
         return f"""
@@ -61,7 +63,7 @@ ProgressUpdate:
     stage={self.stage},
     progress={int(self.progress)},
     message={self.message},
-    time={self.timestamp.isoformat()})
+    time={self.iso_timestamp})
 """
 
     def __repr__(self) -> str:
@@ -76,7 +78,7 @@ class TaskStatus(BaseModel):
     task_id: str | None = None
     state: TaskState
     created_at: datetime = Field(default_factory=_utc_now)
-    updated_at: datetime = Field(default_factory=_utc_now)
+    updated_at: datetime = Field(default_factory=_created_at)
     progress: list[ProgressUpdate] = Field(default_factory=list)
     error: str | None = None
     result: dict[str, Any] | None = None
@@ -89,10 +91,13 @@ class TaskStatus(BaseModel):
         message: str | None = None,
     ) -> None:
         """Update task progress."""
+        now = _utc_now()
         self.progress.append(
-            ProgressUpdate(stage=stage, progress=progress, message=message)
+            ProgressUpdate(
+                stage=stage, progress=progress, message=message, timestamp=now
+            )
         )
-        self.updated_at = _utc_now()
+        self.updated_at = now
 
     @property
     def latest_progress(self) -> ProgressUpdate | None:
@@ -102,19 +107,10 @@ class TaskStatus(BaseModel):
     @property
     def progress_stages(self) -> list[str]:
         """Get unique stages in progress."""
-        return list({update.stage for update in self.progress})
+        return list(self.stage_progress)
 
     @property
     def stage_progress(self) -> dict[str, float]:
         """Get progress by stage."""
-        return {
-            stage: next(
-                (
-                    update.progress
-                    for update in reversed(self.progress)
-                    if update.stage == stage
-                ),
-                0.0,
-            )
-            for stage in self.progress_stages
-        }
+        # Later updates overwrite earlier ones, leaving each stage's latest
+        return {update.stage: update.progress for update in self.progress}
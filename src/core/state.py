@@ -1,15 +1,20 @@
 """State management for task execution."""
 
+import zlib
+from collections.abc import Callable
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
+import orjson
 from loguru import logger
 from pydantic import ValidationError
 from redis import Redis
+from redis.client import Pipeline
 from redis.exceptions import RedisError
 
-from src.core.config import settings
-from src.core.models import TaskState, TaskStatus
+from src.core.config import redis_pool
+from src.core.models import ProgressUpdate, TaskState, TaskStatus
 
 
 def _utc_now() -> datetime:
@@ -17,53 +22,193 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+# Results at least this many bytes long are stored compressed. Full API
+# analyses compress several times over; short results aren't worth the CPU.
+RESULT_COMPRESSION_THRESHOLD = 1024
+# zlib streams start with this byte, which a JSON object never does
+_ZLIB_HEADER = b"x"
+
+
+def _encode_result(result: dict[str, Any]) -> bytes:
+    """Encode a job result for storage, compressing it if it is large."""
+    data = orjson.dumps(result)
+    if len(data) >= RESULT_COMPRESSION_THRESHOLD:
+        return zlib.compress(data)
+    return data
+
+
+def _decode_result(data: bytes) -> dict[str, Any]:
+    """Decode a stored job result, compressed or not."""
+    if data.startswith(_ZLIB_HEADER):
+        data = zlib.decompress(data)
+    return orjson.loads(data)
+
+
+@lru_cache(maxsize=1024)
+def _job_keys(job_id: str) -> tuple[str, str]:
+    """Get the Redis keys for a job's state hash and progress list.
+
+    A job's keys are looked up on every state change and poll, so they are
+    built once per job.
+    """
+    return f"job:{job_id}:state", f"job:{job_id}:progress"
+
+
 class StateStore:
-    """Store for task state information."""
+    """Store for task state information.
+
+    A job's state is kept in a Redis hash so that each transition only writes
+    the fields it changes, without reading the state first. Progress updates
+    are kept in a list next to it, so recording one appends a single entry.
+    """
 
     # 24 hours TTL for task states
     TASK_STATE_TTL = 24 * 60 * 60
+    # Job locks expire on their own so a killed worker can't hold one forever;
+    # this covers the Celery task time limit
+    JOB_LOCK_TTL = 32 * 60
 
     def __init__(self) -> None:
         """Initialize the state store."""
-        self.redis = Redis.from_url(settings.REDIS_URL)
+        self.redis = Redis(connection_pool=redis_pool)
 
     def _get_key(self, job_id: str) -> str:
-        """Get Redis key for a job."""
-        return f"job:{job_id}"
+        """Get Redis key for a job's state hash."""
+        return _job_keys(job_id)[0]
+
+    def _get_progress_key(self, job_id: str) -> str:
+        """Get Redis key for a job's list of progress updates."""
+        return _job_keys(job_id)[1]
+
+    def _get_lock_key(self, job_id: str) -> str:
+        """Get Redis key for a job's processing lock."""
+        return f"lock:job:{job_id}"
+
+    def acquire_job_lock(self, job_id: str) -> bool:
+        """Try to take the processing lock for a job.
+
+        Returns:
+            True if the lock was taken, False if it is already held
+        """
+        try:
+            key = self._get_lock_key(job_id)
+            return bool(self.redis.set(key, 1, nx=True, ex=self.JOB_LOCK_TTL))
+        except RedisError as e:
+            logger.error(f"Error acquiring lock for job {job_id}: {e}")
+            return False
+
+    def release_job_lock(self, job_id: str) -> None:
+        """Release the processing lock for a job."""
+        try:
+            self.redis.delete(self._get_lock_key(job_id))
+        except RedisError as e:
+            logger.error(f"Error releasing lock for job {job_id}: {e}")
 
     def get_state(self, job_id: str) -> TaskStatus | None:
         """Get the current state of a job."""
         try:
-            key = self._get_key(job_id)
-            data = self.redis.get(key)
-            if not data:
-                return None
-            return TaskStatus.model_validate_json(data)
-        except (RedisError, ValidationError) as e:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hgetall(self._get_key(job_id))
+            pipe.lrange(self._get_progress_key(job_id), 0, -1)
+            fields, progress = pipe.execute()
+        except RedisError as e:
+            logger.error(f"Error getting state for job {job_id}: {e}")
+            return None
+
+        if not fields:
+            return None
+        try:
+            result = fields.pop(b"result", None)
+            data: dict[str, Any] = {
+                name.decode(): value.decode() for name, value in fields.items()
+            }
+            if result is not None:
+                data["result"] = _decode_result(result)
+            return TaskStatus(
+                **data,
+                progress=[
+                    ProgressUpdate.model_validate_json(update) for update in progress
+                ],
+            )
+        except (orjson.JSONDecodeError, zlib.error, ValidationError) as e:
             logger.error(f"Error getting state for job {job_id}: {e}")
             return None
 
     def set_state(self, state: TaskStatus) -> None:
-        """Set the state for a job."""
+        """Set the state for a job, replacing any stored state and progress."""
+        key = self._get_key(state.job_id)
+        progress_key = self._get_progress_key(state.job_id)
+        fields: dict[str, Any] = {
+            "job_id": state.job_id,
+            "state": state.state.value,
+            "created_at": state.created_at.isoformat(),
+            "updated_at": state.updated_at.isoformat(),
+            "retries": state.retries,
+        }
+        if state.task_id is not None:
+            fields["task_id"] = state.task_id
+        if state.error is not None:
+            fields["error"] = state.error
+        if state.result is not None:
+            fields["result"] = _encode_result(state.result)
+
         try:
-            key = self._get_key(state.job_id)
-            self.redis.setex(key, self.TASK_STATE_TTL, state.model_dump_json())
+            pipe = self.redis.pipeline()
+            pipe.delete(key, progress_key)
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, self.TASK_STATE_TTL)
+            if state.progress:
+                pipe.rpush(
+                    progress_key,
+                    *(update.model_dump_json() for update in state.progress),
+                )
+                pipe.expire(progress_key, self.TASK_STATE_TTL)
+            pipe.execute()
         except RedisError as e:
             logger.error(f"Error setting state for job {state.job_id}: {e}")
 
+    def _update_fields(
+        self,
+        job_id: str,
+        now: datetime,
+        fields: dict[str, Any],
+        extra: Callable[[Pipeline], object] | None = None,
+    ) -> None:
+        """Write changed state fields for a job in one MULTI/EXEC.
+
+        A job without stored state gets its job ID and creation time, so any
+        update also creates the state.
+
+        Args:
+            job_id: Job identifier
+            now: Time of the update
+            fields: State fields to set
+            extra: Queues further commands on the same transaction
+        """
+        key = self._get_key(job_id)
+        timestamp = now.isoformat()
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hsetnx(key, "job_id", job_id)
+            pipe.hsetnx(key, "created_at", timestamp)
+            pipe.hset(key, mapping={**fields, "updated_at": timestamp})
+            if extra:
+                extra(pipe)
+            pipe.expire(key, self.TASK_STATE_TTL)
+            pipe.execute()
+        except RedisError as e:
+            logger.error(f"Error setting state for job {job_id}: {e}")
+
     def set_task_id(self, job_id: str, task_id: str) -> None:
-        """Set the task ID for a job."""
-        state = self.get_state(job_id)
-        if not state:
-            state = TaskStatus(
-                job_id=job_id,
-                task_id=task_id,
-                state=TaskState.STARTED,
-            )
-        else:
-            state.task_id = task_id
-            state.updated_at = _utc_now()
-        self.set_state(state)
+        """Set the task ID for a job, starting it if it has no state yet."""
+        self._update_fields(
+            job_id,
+            _utc_now(),
+            {"task_id": task_id},
+            lambda pipe: pipe.hsetnx(
+                self._get_key(job_id), "state", TaskState.STARTED.value
+            ),
+        )
 
     def set_started(self, job_id: str) -> None:
         """Set a job as started."""
@@ -75,50 +220,28 @@ class StateStore:
 
     def set_success(self, job_id: str, result: dict[str, Any]) -> None:
         """Set a job as successful."""
-        state = self.get_state(job_id)
-        if not state:
-            state = TaskStatus(
-                job_id=job_id,
-                state=TaskState.SUCCESS,
-                result=result,
-            )
-        else:
-            state.state = TaskState.SUCCESS
-            state.result = result
-            state.updated_at = _utc_now()
-        self.set_state(state)
+        self._update_fields(
+            job_id,
+            _utc_now(),
+            {"state": TaskState.SUCCESS.value, "result": _encode_result(result)},
+        )
 
     def set_failure(self, job_id: str, error: str) -> None:
         """Set a job as failed."""
-        state = self.get_state(job_id)
-        if not state:
-            state = TaskStatus(
-                job_id=job_id,
-                state=TaskState.FAILURE,
-                error=error,
-            )
-        else:
-            state.state = TaskState.FAILURE
-            state.error = error
-            state.updated_at = _utc_now()
-        self.set_state(state)
+        self._update_fields(
+            job_id,
+            _utc_now(),
+            {"state": TaskState.FAILURE.value, "error": error},
+        )
 
     def set_retry(self, job_id: str, error: str) -> None:
         """Set a job as retried, incrementing retry count."""
-        state = self.get_state(job_id)
-        if not state:
-            state = TaskStatus(
-                job_id=job_id,
-                state=TaskState.FAILURE,
-                error=error,
-                retries=1,
-            )
-        else:
-            state.state = TaskState.FAILURE
-            state.error = error
-            state.retries += 1
-            state.updated_at = _utc_now()
-        self.set_state(state)
+        self._update_fields(
+            job_id,
+            _utc_now(),
+            {"state": TaskState.FAILURE.value, "error": error},
+            lambda pipe: pipe.hincrby(self._get_key(job_id), "retries", 1),
+        )
 
     def update_progress(
         self,
@@ -127,15 +250,18 @@ class StateStore:
         progress: float,
         message: str | None = None,
     ) -> None:
-        """Update progress for a job."""
-        state = self.get_state(job_id)
-        if not state:
-            state = TaskStatus(
-                job_id=job_id,
-                state=TaskState.PROGRESS,
-            )
-        state.update_progress(stage, progress, message)
-        self.set_state(state)
+        """Record a progress update for a job and mark it in progress."""
+        now = _utc_now()
+        update = ProgressUpdate(
+            stage=stage, progress=progress, message=message, timestamp=now
+        )
+        progress_key = self._get_progress_key(job_id)
+
+        def append(pipe: Pipeline) -> None:
+            pipe.rpush(progress_key, update.model_dump_json())
+            pipe.expire(progress_key, self.TASK_STATE_TTL)
+
+        self._update_fields(job_id, now, {"state": TaskState.PROGRESS.value}, append)
 
 
 # Global state store instance
@@ -1,10 +1,18 @@
 """Job data storage utilities."""
 
-import json
-from datetime import datetime, timezone
+import io
+import os
+import shutil
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
+from uuid import uuid4
 
+import orjson
 from docx import Document
 from loguru import logger
 
@@ -13,6 +21,20 @@ from src.core.config import settings
 # Default path for job data, can be overridden in tests
 JOB_DATA_ROOT = settings.job_data_path
 
+# Job IDs are ULIDs: 10 Crockford base32 characters of millisecond timestamp
+# followed by 16 of randomness, so they sort by creation time
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_CHARS = frozenset(_ULID_ALPHABET)
+_ULID_TIME_LENGTH = 10
+_ULID_RANDOM_LENGTH = 16
+_ULID_LENGTH = _ULID_TIME_LENGTH + _ULID_RANDOM_LENGTH
+
+# Job directories this process has already created
+_initialized_job_dirs: set[Path] = set()
+
+# Buffer size for streaming uploaded specs to disk
+_COPY_BUFFER_SIZE = 64 * 1024
+
 
 class JobArtifact(str, Enum):
     """Types of artifacts that can be stored for a job."""
@@ -39,21 +61,130 @@ class ExportFormat(str, Enum):
     DOCX = "docx"
 
 
+EXPORT_MEDIA_TYPES: dict[ExportFormat, str] = {
+    ExportFormat.MARKDOWN: "text/markdown",
+    ExportFormat.HTML: "text/html",
+    ExportFormat.DOCX: (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def _docx_placeholder() -> bytes:
+    """Render the placeholder DOCX export once."""
+    doc = Document()
+    doc.add_heading("API Summary", 0)
+    doc.add_paragraph("To be implemented")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# Placeholder content for each export format until exports are generated
+_EXPORT_PLACEHOLDERS: dict[ExportFormat, Callable[[], bytes]] = {
+    ExportFormat.MARKDOWN: lambda: b"# API Summary\n\nTo be implemented",
+    ExportFormat.HTML: lambda: b"<h1>API Summary</h1>\n<p>To be implemented</p>",
+    ExportFormat.DOCX: _docx_placeholder,
+}
+
+
+@contextmanager
+def _atomic_writer(path: Path, *, overwrite: bool = True) -> Iterator[BinaryIO]:
+    """Open a file for writing so that readers only ever see it complete.
+
+    Data is written to a temporary file next to path, which is moved into place
+    once the block exits cleanly. Without overwrite, FileExistsError is raised
+    instead of replacing an existing file.
+    """
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            yield f
+        if overwrite:
+            tmp_path.replace(path)
+        else:
+            path.hardlink_to(tmp_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
 def _get_and_log_path(path: Path, job_id: str, artifact: str) -> Path | None:
     """Check if a path exists and log the result."""
     if path.exists():
-        logger.debug(f"Found {job_id} {artifact} at {path}")
+        logger.debug("Found {} {} at {}", job_id, artifact, path)
         return path
-    logger.debug(f"No {job_id} {artifact} found at {path}")
+    logger.debug("No {} {} found at {}", job_id, artifact, path)
     return None
 
 
+def _encode_base32(value: int, length: int) -> str:
+    """Encode an integer as fixed-width Crockford base32."""
+    chars = []
+    for _ in range(length):
+        value, index = divmod(value, 32)
+        chars.append(_ULID_ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+def _ulid_time_prefix(timestamp: datetime) -> str:
+    """Encode a timestamp as the time component of a ULID."""
+    return _encode_base32(int(timestamp.timestamp() * 1000), _ULID_TIME_LENGTH)
+
+
+def new_job_id() -> str:
+    """Generate a new time-ordered job ID."""
+    randomness = int.from_bytes(os.urandom(10))
+    return _ulid_time_prefix(datetime.now(tz=timezone.utc)) + _encode_base32(
+        randomness, _ULID_RANDOM_LENGTH
+    )
+
+
+def delete_expired_jobs(max_age: timedelta) -> int:
+    """Delete the data of jobs created more than max_age ago.
+
+    Job directories are visited in ID order, which is creation order, so the
+    scan stops at the first job that is still within max_age. Directories that
+    aren't named by a ULID are left alone.
+
+    Returns:
+        Number of job directories deleted
+    """
+    if not JOB_DATA_ROOT.exists():
+        return 0
+
+    cutoff = _ulid_time_prefix(datetime.now(tz=timezone.utc) - max_age)
+    deleted = 0
+    for job_dir in sorted(JOB_DATA_ROOT.iterdir()):
+        name = job_dir.name
+        if len(name) != _ULID_LENGTH or not _ULID_CHARS.issuperset(name):
+            continue
+        if name[:_ULID_TIME_LENGTH] >= cutoff:
+            break
+        shutil.rmtree(job_dir)
+        _initialized_job_dirs.discard(job_dir)
+        deleted += 1
+
+    if deleted:
+        job_storage.cache_clear()
+
+    logger.info(f"Deleted {deleted} expired jobs from {JOB_DATA_ROOT}")
+    return deleted
+
+
 class JobStorage:
     """Handles storage and retrieval of job-related data."""
 
     def __init__(self, job_id: str) -> None:
         self.job_id = job_id
         self.job_dir = JOB_DATA_ROOT / job_id
+        self.log_file = self.job_dir / "execution.log"
+        # Set once the spec's extension is known, so lookups stat one path
+        self._spec_path: Path | None = None
+
+        # Skip the filesystem setup for jobs this process has already set up
+        if self.job_dir in _initialized_job_dirs:
+            return
 
         # Ensure root directory exists with proper permissions
         JOB_DATA_ROOT.mkdir(mode=0o755, parents=True, exist_ok=True)
@@ -61,14 +192,27 @@ class JobStorage:
         self.job_dir.mkdir(mode=0o755, parents=True, exist_ok=True)
 
         # Initialize log file
-        self.log_file = self.job_dir / "execution.log"
         if not self.log_file.exists():
             self.log_file.touch(mode=0o644)
 
+        _initialized_job_dirs.add(self.job_dir)
+
     def save_spec(self, content: str, format_: SpecFormat) -> Path:
         """Save the uploaded spec file."""
         spec_path = self.job_dir / f"spec.{format_.value}"
-        spec_path.write_text(content)
+        with _atomic_writer(spec_path) as f:
+            f.write(content.encode())
+        self._spec_path = spec_path
+        self.log_event("Saved spec file")
+        logger.info(f"Saved {self.job_id} spec to {spec_path}")
+        return spec_path
+
+    def save_spec_file(self, source: BinaryIO, format_: SpecFormat) -> Path:
+        """Stream an uploaded spec file to disk without reading it into memory."""
+        spec_path = self.job_dir / f"spec.{format_.value}"
+        with _atomic_writer(spec_path) as out:
+            shutil.copyfileobj(source, out, length=_COPY_BUFFER_SIZE)
+        self._spec_path = spec_path
         self.log_event("Saved spec file")
         logger.info(f"Saved {self.job_id} spec to {spec_path}")
         return spec_path
@@ -76,26 +220,26 @@ class JobStorage:
     def save_summary(self, summary: dict) -> Path:
         """Save the generated summary."""
         summary_path = self.job_dir / "summary.json"
-        summary_path.write_text(json.dumps(summary, indent=2))
+        with _atomic_writer(summary_path) as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
         self.log_event("Saved summary")
         logger.info(f"Saved {self.job_id} summary to {summary_path}")
         return summary_path
 
     def save_export(self, content: str | bytes, format_: ExportFormat) -> Path:
         """Save an exported summary file."""
-        export_path = self.job_dir / f"summary.{format_}"
-        if isinstance(content, str):
-            export_path.write_text(content)
-        else:
-            export_path.write_bytes(content)
-        self.log_event(f"Saved {format_} export")
+        export_path = self.job_dir / f"summary.{format_.value}"
+        with _atomic_writer(export_path) as f:
+            f.write(content.encode() if isinstance(content, str) else content)
+        self.log_event(f"Saved {format_.value} export")
         logger.info(f"Saved {self.job_id} export to {export_path}")
         return export_path
 
     def save_parsed_spec(self, parsed_spec: dict) -> Path:
         """Save the parsed OpenAPI spec."""
         parsed_spec_path = self.job_dir / "parsed_spec.json"
-        parsed_spec_path.write_text(json.dumps(parsed_spec, indent=2))
+        with _atomic_writer(parsed_spec_path) as f:
+            f.write(orjson.dumps(parsed_spec, option=orjson.OPT_INDENT_2))
         self.log_event("Saved parsed spec")
         logger.info(f"Saved {self.job_id} parsed spec to {parsed_spec_path}")
         return parsed_spec_path
@@ -107,15 +251,24 @@ class JobStorage:
             message: Event message to log
         """
         timestamp = datetime.now(tz=timezone.utc).isoformat()
-        log_entry = f"[{timestamp}] {message}\n"
-        with self.log_file.open("a") as f:
-            f.write(log_entry)
+        log_entry = f"[{timestamp}] {message}\n".encode()
+        # The API and the worker both append to a job's log, so write each
+        # entry unbuffered in a single O_APPEND write to keep entries whole
+        fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, log_entry)
+        finally:
+            os.close(fd)
 
     def get_spec_path(self) -> Path | None:
         """Get the path to the spec file if it exists."""
+        if self._spec_path:
+            return _get_and_log_path(self._spec_path, self.job_id, JobArtifact.SPEC)
+
         for ext in ["yaml", "json"]:
             path = self.job_dir / f"spec.{ext}"
             if ext_path := _get_and_log_path(path, self.job_id, JobArtifact.SPEC):
+                self._spec_path = ext_path
                 return ext_path
         return None
 
@@ -126,7 +279,7 @@ class JobStorage:
 
     def get_export_path(self, format_: ExportFormat) -> Path | None:
         """Get the path to an export file if it exists."""
-        path = self.job_dir / f"summary.{format_}"
+        path = self.job_dir / f"summary.{format_.value}"
         return _get_and_log_path(path, self.job_id, JobArtifact.EXPORT)
 
     def get_parsed_spec_path(self) -> Path | None:
@@ -140,41 +293,26 @@ class JobStorage:
 
     def ensure_export_exists(self, format_: ExportFormat) -> Path:
         """Ensure an export file exists, creating a placeholder if needed."""
-        path = self.job_dir / f"summary.{format_}"
-        logger.info(f"Checking if {self.job_id} {format_} export exists at {path}")
-
+        path = self.job_dir / f"summary.{format_.value}"
         if path.exists():
             return path
 
-        logger.info(f"Creating {self.job_id} {format_} export at {path}")
-
-        if format_ == ExportFormat.MARKDOWN:
-            path.write_text("# API Summary\n\nTo be implemented")
-        elif format_ == ExportFormat.HTML:
-            path.write_text("<h1>API Summary</h1>\n<p>To be implemented</p>")
-        elif format_ == ExportFormat.DOCX:
-            # Create a minimal DOCX file with a title
-            doc = Document()
-            doc.add_heading("API Summary", 0)
-            doc.add_paragraph("To be implemented")
-            doc.save(str(path))
+        # Never replace an export that was saved since the check above
+        try:
+            with _atomic_writer(path, overwrite=False) as f:
+                f.write(_EXPORT_PLACEHOLDERS[format_]())
+        except FileExistsError:
+            return path
 
+        logger.info("Created {} {} export at {}", self.job_id, format_.value, path)
         return path
 
-    def get_export_content(self, format_: ExportFormat) -> tuple[str | bytes, str]:
-        """Get export content and media type for a given format.
 
-        Returns:
-            A tuple of (content, media_type)
-        """
-        path = self.ensure_export_exists(format_)
-
-        if format_ == ExportFormat.HTML:
-            return path.read_text(), "text/html"
-        if format_ == ExportFormat.DOCX:
-            return (
-                path.read_bytes(),
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            )
-        # MARKDOWN
-        return path.read_text(), "text/markdown"
+@lru_cache(maxsize=1024)
+def job_storage(job_id: str) -> JobStorage:
+    """Get the storage for a job, reusing it across requests.
+
+    JobStorage only holds paths derived from the job ID, so instances can be
+    shared; this skips the directory setup when a job is polled repeatedly.
+    """
+    return JobStorage(job_id)
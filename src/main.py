@@ -6,7 +6,7 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from loguru import logger  # type: ignore
 
@@ -29,6 +29,7 @@ app = FastAPI(
     title="API Introspection Service",
     description="Service for analyzing OpenAPI specifications",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Mount the static files directory
@@ -1,5 +1,13 @@
 """OpenAI integration for API analysis."""
 
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import orjson
 from loguru import logger
 from openai import OpenAI
 from openai.types.chat import (
@@ -14,6 +22,18 @@ from src.services.prompts import format_spec_for_analysis
 
 client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
+# Cap on concurrent endpoint completions, to stay within API rate limits
+MAX_CONCURRENT_COMPLETIONS = 8
+
+# Completions are cached on disk so retried tasks and restarted workers don't
+# request them again; can be overridden in tests
+COMPLETION_CACHE_DIR = settings.job_data_path / ".llm_cache"
+
+SYSTEM_PROMPT = (
+    "You are an expert in API documentation and technical writing. "
+    "Provide clear, concise, and technically accurate responses."
+)
+
 
 class EndpointAnalysis(BaseModel):
     """Analysis of an API endpoint."""
@@ -56,20 +76,31 @@ def get_llm_spec_analysis(
     logger.info("Generating API overview")
     overview = _get_completion(spec_analysis["overview"], config)
 
-    # Analyze each endpoint
-    logger.info("Analyzing endpoints")
-    endpoint_analyses: list[EndpointAnalysis] = []
-    for endpoint in spec_analysis["endpoints"]:
-        logger.info(f"Analyzing endpoint: {endpoint['method']} {endpoint['path']}")
-        endpoint_analysis = _get_completion(endpoint["analysis"], config)
-        endpoint_analyses.append(
-            EndpointAnalysis(
-                path=endpoint["path"],
-                method=endpoint["method"],
-                analysis=endpoint_analysis,
+    # Analyze the endpoints concurrently; each completion is independent, and
+    # endpoints with identical prompts share one completion
+    endpoints = spec_analysis["endpoints"]
+    prompts = list(dict.fromkeys(endpoint["analysis"] for endpoint in endpoints))
+    logger.info(
+        "Analyzing {} endpoints with {} unique prompts", len(endpoints), len(prompts)
+    )
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_COMPLETIONS) as executor:
+        completions = dict(
+            zip(
+                prompts,
+                executor.map(lambda prompt: _get_completion(prompt, config), prompts),
+                strict=True,
             )
         )
 
+    endpoint_analyses = [
+        EndpointAnalysis(
+            path=endpoint["path"],
+            method=endpoint["method"],
+            analysis=completions[endpoint["analysis"]],
+        )
+        for endpoint in endpoints
+    ]
+
     return SpecAnalysis(overview=overview, endpoints=endpoint_analyses)
 
 
@@ -84,21 +115,22 @@ def _get_completion(prompt: str, config: LLMConfig | None = None) -> str:
     Returns:
         str: The generated text
     """
-    system_prompt = (
-        "You are an expert in API documentation and technical writing. "
-        "Provide clear, concise, and technically accurate responses."
-    )
+    if config is None:
+        config = LLMConfig()
+
+    cache_path = _completion_cache_path(prompt, config)
+    try:
+        return cache_path.read_text()
+    except FileNotFoundError:
+        pass
 
     messages: list[
         ChatCompletionSystemMessageParam | ChatCompletionUserMessageParam
     ] = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": prompt},
     ]
 
-    if config is None:
-        config = LLMConfig()
-
     try:
         response = client.chat.completions.create(
             model=config.model,
@@ -107,7 +139,59 @@ def _get_completion(prompt: str, config: LLMConfig | None = None) -> str:
             max_tokens=config.max_tokens,
         )
         content = response.choices[0].message.content
-        return content.strip() if content else ""
     except Exception as e:
         logger.error(f"Error getting completion: {e}")
         raise
+
+    completion = content.strip() if content else ""
+    _cache_completion(cache_path, completion)
+    return completion
+
+
+def _completion_cache_path(prompt: str, config: LLMConfig) -> Path:
+    """Get the cache file for a completion of a prompt with a given config."""
+    key = hashlib.blake2b(
+        orjson.dumps([SYSTEM_PROMPT, prompt, config.model_dump()]), digest_size=20
+    ).hexdigest()
+    return COMPLETION_CACHE_DIR / key[:2] / key
+
+
+def _cache_completion(path: Path, completion: str) -> None:
+    """Save a completion to the cache.
+
+    The completion is written to a temporary file and renamed into place, so
+    concurrent readers never see a partial entry. Failing to cache isn't an
+    error; the completion is just requested again next time.
+    """
+    tmp_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(completion)
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning("Failed to cache completion at {}: {}", path, e)
+        tmp_path.unlink(missing_ok=True)
+
+
+def delete_expired_completions(max_age: timedelta) -> int:
+    """Delete cached completions written more than max_age ago.
+
+    Returns:
+        Number of cached completions deleted
+    """
+    cutoff = time.time() - max_age.total_seconds()
+    deleted = 0
+    for path in COMPLETION_CACHE_DIR.glob("*/*"):
+        # Temporary files belong to writes in progress
+        if path.suffix == ".tmp":
+            continue
+        try:
+            expired = path.stat().st_mtime < cutoff
+        except FileNotFoundError:
+            continue
+        if expired:
+            path.unlink(missing_ok=True)
+            deleted += 1
+
+    logger.info(f"Deleted {deleted} expired completions from {COMPLETION_CACHE_DIR}")
+    return deleted
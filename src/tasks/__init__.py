@@ -1,15 +1,5 @@
 """Task package for API processing."""
 
-from src.tasks.pipeline import (
-    analyze_spec_task,
-    create_processing_chain,
-    generate_outputs_task,
-    parse_spec_task,
-)
+from src.tasks.pipeline import process_spec_pipeline
 
-__all__ = [
-    "analyze_spec_task",
-    "create_processing_chain",
-    "generate_outputs_task",
-    "parse_spec_task",
-]
+__all__ = ["process_spec_pipeline"]
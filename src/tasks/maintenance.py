@@ -0,0 +1,30 @@
+"""Periodic maintenance tasks."""
+
+from datetime import timedelta
+
+from loguru import logger
+
+from src.core.celery_app import celery_app
+from src.core.config import settings
+from src.core.storage import delete_expired_jobs
+from src.services.llm import delete_expired_completions
+
+
+@celery_app.task
+def cleanup_expired_jobs() -> int:
+    """Delete job data older than the configured retention period.
+
+    Job state in Redis expires on its own; this removes the files on disk,
+    along with cached LLM completions of the same age.
+    """
+    max_age = timedelta(days=settings.JOB_RETENTION_DAYS)
+    deleted = delete_expired_jobs(max_age)
+
+    # The completion cache is only an optimization, so failing to prune it
+    # shouldn't fail the job cleanup
+    try:
+        delete_expired_completions(max_age)
+    except OSError:
+        logger.exception("Failed to delete expired completions")
+
+    return deleted
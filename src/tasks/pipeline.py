@@ -1,14 +1,11 @@
-"""Chain-based API processing pipeline."""
+"""API processing pipeline."""
 
 from typing import Any
 
 from celery import Task  # type: ignore
-from celery import chain as celery_chain  # type: ignore
-from celery.canvas import Signature  # type: ignore
 from loguru import logger
 
 from src.core.celery_app import celery_app
-from src.core.models import TaskState
 from src.core.state import state_store
 from src.core.storage import JobStorage
 from src.services.llm import EndpointAnalysis, SpecAnalysis
@@ -30,6 +27,13 @@ class TaskIDError(TaskError):
         super().__init__("Task ID is required")
 
 
+class SpecNotFoundError(TaskError):
+    """Uploaded spec is missing from job storage."""
+
+    def __init__(self) -> None:
+        super().__init__("Uploaded OpenAPI spec not found")
+
+
 class ParseError(TaskError):
     """Error parsing OpenAPI spec."""
 
@@ -59,222 +63,190 @@ def update_progress(
 ) -> None:
     """Update job progress."""
     state_store.update_progress(job_id, stage, progress, message)
-    # Update overall state to PROGRESS
-    state = state_store.get_state(job_id)
-    if state and state.state == TaskState.STARTED:
-        state.state = TaskState.PROGRESS
-        state_store.set_state(state)
 
 
-@celery_app.task(bind=True, max_retries=3)
-def parse_spec_task(self: Task, content: str, job_id: str) -> dict[str, Any]:
-    """Parse and validate OpenAPI spec.
+def _load_spec(job_id: str) -> str:
+    """Read the uploaded spec from job storage.
 
     Args:
-        self: Task instance
-        content: Raw OpenAPI spec content
         job_id: Job identifier
 
     Returns:
-        dict: Dictionary containing parsed spec JSON and job_id
+        str: Raw OpenAPI spec content
+
+    Raises:
+        SpecNotFoundError: If no spec was saved for the job
     """
-    logger.info(f"[{job_id}] Starting parse_spec_task with task_id: {self.request.id}")
+    spec_path = JobStorage(job_id).get_spec_path()
+    if spec_path is None:
+        raise SpecNotFoundError()
+    return spec_path.read_text()
 
-    if not self.request.id:
-        raise TaskIDError()
 
-    try:
-        # Update task ID and ensure state is PROGRESS
-        state_store.set_task_id(job_id, self.request.id)
-        update_progress(
-            job_id,
-            stage="parsing",
-            progress=0,
-            message="Starting OpenAPI spec parsing",
-        )
-    except Exception as e:
-        logger.error(f"[{job_id}] Error in parse_spec_task: {e!s}", exc_info=True)
-        state_store.set_failure(job_id, str(e))
-        raise self.retry(exc=e, countdown=5) from e
+def _parse_spec(content: str, job_id: str) -> ParsedSpec:
+    """Parse and validate an OpenAPI spec, saving the parsed result.
 
-    try:
-        parsed_spec = parse_openapi_spec(content)
-        storage = JobStorage(job_id)
+    Args:
+        content: Raw OpenAPI spec content
+        job_id: Job identifier
 
-        # Save parsed spec using model_dump for consistent serialization
-        spec_dict = parsed_spec.model_dump(mode="json")
-        storage.save_parsed_spec(spec_dict)
+    Returns:
+        ParsedSpec: The parsed spec
+    """
+    update_progress(
+        job_id,
+        stage="parsing",
+        progress=0,
+        message="Starting OpenAPI spec parsing",
+    )
 
-        update_progress(
-            job_id,
-            stage="parsing",
-            progress=100,
-            message="Successfully parsed OpenAPI spec",
-        )
+    parsed_spec = parse_openapi_spec(content)
+    storage = JobStorage(job_id)
 
-    except Exception as e:
-        logger.error(f"[{job_id}] Error in parse_spec_task: {e!s}", exc_info=True)
-        state_store.set_failure(job_id, str(e))
-        raise self.retry(exc=e, countdown=5) from e
+    # Save parsed spec using model_dump for consistent serialization
+    storage.save_parsed_spec(parsed_spec.model_dump(mode="json"))
 
-    else:
-        # Use the same serialization method for the result
-        return {
-            "spec": spec_dict,  # Already JSON-serializable
-            "job_id": job_id,
-            "task_id": self.request.id,
-        }
+    update_progress(
+        job_id,
+        stage="parsing",
+        progress=100,
+        message="Successfully parsed OpenAPI spec",
+    )
+    return parsed_spec
 
 
-@celery_app.task(bind=True, max_retries=3)
-def analyze_spec_task(self: Task, parse_result: dict[str, Any]) -> dict[str, Any]:
-    """Analyze spec using LLM.
+def _analyze_spec(parsed_spec: ParsedSpec, job_id: str) -> dict[str, Any]:
+    """Analyze a parsed spec using LLM.
 
     Args:
-        self: Task instance
-        parse_result: Result from parse task containing spec JSON and job_id
+        parsed_spec: The parsed spec
+        job_id: Job identifier
 
     Returns:
         dict: Analysis results with spec info, summary, and endpoints
     """
-    job_id = parse_result["job_id"]
-    logger.info(
-        f"[{job_id}] Starting analyze_spec_task with task_id: {self.request.id}"
+    update_progress(
+        job_id,
+        stage="analysis",
+        progress=0,
+        message="Starting LLM analysis",
     )
 
-    if not self.request.id:
-        raise TaskIDError()
+    # Mock analysis for now
+    mock_analysis = SpecAnalysis(
+        overview="Test API overview",
+        endpoints=[
+            EndpointAnalysis(
+                path="/test", method="GET", analysis="Test endpoint analysis"
+            )
+        ],
+    )
 
-    try:
-        # Update task ID and progress
-        state_store.set_task_id(job_id, self.request.id)
-        update_progress(
-            job_id,
-            stage="analysis",
-            progress=0,
-            message="Starting LLM analysis",
-        )
-    except Exception as e:
-        logger.error(f"[{job_id}] Error in analyze_spec_task: {e!s}", exc_info=True)
-        state_store.set_failure(job_id, str(e))
-        raise self.retry(exc=e, countdown=5) from e
+    update_progress(
+        job_id,
+        stage="analysis",
+        progress=100,
+        message="Completed LLM analysis",
+    )
 
-    try:
-        # Convert dict back to ParsedSpec
-        parsed_spec = ParsedSpec.model_validate(parse_result["spec"])
-
-        # Mock analysis for now
-        mock_analysis = SpecAnalysis(
-            overview="Test API overview",
-            endpoints=[
-                EndpointAnalysis(
-                    path="/test", method="GET", analysis="Test endpoint analysis"
-                )
-            ],
-        )
-
-        update_progress(
-            job_id,
-            stage="analysis",
-            progress=100,
-            message="Completed LLM analysis",
-        )
-
-        # Create complete result
-        return {
-            "spec_info": {
-                "title": parsed_spec.title,
-                "version": parsed_spec.version,
-                "description": parsed_spec.description,
-            },
-            "summary": mock_analysis.model_dump(),
-            "endpoints": [endpoint.model_dump() for endpoint in parsed_spec.endpoints],
-            "job_id": job_id,
-            "task_id": self.request.id,
-            "previous_task": parse_result["task_id"],
-        }
+    return {
+        "spec_info": {
+            "title": parsed_spec.title,
+            "version": parsed_spec.version,
+            "description": parsed_spec.description,
+        },
+        "summary": mock_analysis.model_dump(),
+        "endpoints": [endpoint.model_dump() for endpoint in parsed_spec.endpoints],
+    }
 
-    except Exception as e:
-        logger.error(f"[{job_id}] Error in analyze_spec_task: {e!s}", exc_info=True)
-        state_store.set_failure(job_id, str(e))
-        raise self.retry(exc=e, countdown=5) from e
+
+def _generate_outputs(analysis_result: dict[str, Any], job_id: str) -> dict[str, Any]:
+    """Generate output files.
+
+    Args:
+        analysis_result: Analysis results from LLM
+        job_id: Job identifier
+
+    Returns:
+        dict: File paths and analysis
+    """
+    update_progress(
+        job_id,
+        stage="export",
+        progress=0,
+        message="Starting export generation",
+    )
+
+    storage = JobStorage(job_id)
+    summary_path = storage.save_summary(analysis_result)
+    log_path = storage.job_dir / "execution.log"
+    logger.info(f"[{job_id}] Saving execution log to {log_path}")
+
+    update_progress(
+        job_id,
+        stage="export",
+        progress=100,
+        message="Completed export generation",
+    )
+
+    return {
+        "summary_path": str(summary_path),
+        "log_path": str(log_path),
+        "analysis": analysis_result,
+    }
 
 
 @celery_app.task(bind=True, max_retries=3)
-def generate_outputs_task(
-    self: Task,
-    analysis_result: dict[str, Any],
-) -> dict[str, Any]:
-    """Generate output files.
+def process_spec_pipeline(self: Task, job_id: str) -> dict[str, Any] | None:
+    """Parse, analyze and export an OpenAPI spec.
+
+    The stages run in a single task: their intermediate results are only
+    consumed by the next stage, so chaining them would just add broker
+    round-trips and re-serialize the spec between stages. The spec is read
+    from job storage, so the broker message only carries the job ID.
 
     Args:
         self: Task instance
-        analysis_result: Analysis results from LLM containing job_id
+        job_id: Job identifier
 
     Returns:
-        dict: Final results including file paths and analysis
+        dict: Final results including file paths and analysis, or None if
+        the job is already being processed by another task
     """
-    job_id = analysis_result.get("job_id")
-    if not job_id:
-        raise ExportError()
-
     logger.info(
-        f"[{job_id}] Starting generate_outputs_task with task_id: {self.request.id}"
+        f"[{job_id}] Starting process_spec_pipeline with task_id: {self.request.id}"
     )
 
     if not self.request.id:
         raise TaskIDError()
 
+    # A redelivered or duplicate message must not run the pipeline twice
+    if not state_store.acquire_job_lock(job_id):
+        logger.warning(f"[{job_id}] Pipeline already running, skipping duplicate")
+        return None
+
     try:
-        # Update task ID and progress
         state_store.set_task_id(job_id, self.request.id)
-        update_progress(
-            job_id,
-            stage="export",
-            progress=0,
-            message="Starting export generation",
-        )
-    except Exception as e:
-        logger.error(f"[{job_id}] Error in generate_outputs_task: {e!s}", exc_info=True)
-        state_store.set_failure(job_id, str(e))
-        raise self.retry(exc=e, countdown=5) from e
 
-    try:
-        storage = JobStorage(job_id)
-        summary_path = storage.save_summary(analysis_result)
-        log_path = storage.job_dir / "execution.log"
-        logger.info(f"[{job_id}] Saving execution log to {log_path}")
-
-        update_progress(
-            job_id,
-            stage="export",
-            progress=100,
-            message="Completed export generation",
-        )
+        content = _load_spec(job_id)
+        parsed_spec = _parse_spec(content, job_id)
+        analysis_result = _analyze_spec(parsed_spec, job_id)
+        outputs = _generate_outputs(analysis_result, job_id)
 
         result = {
-            "summary_path": str(summary_path),
-            "log_path": str(log_path),
-            "analysis": analysis_result,
+            **outputs,
             "job_id": job_id,
             "task_id": self.request.id,
-            "previous_task": analysis_result["task_id"],
         }
         state_store.set_success(job_id, result)
 
     except Exception as e:
-        logger.error(f"[{job_id}] Error in generate_outputs_task: {e!s}", exc_info=True)
+        logger.error(f"[{job_id}] Error in process_spec_pipeline: {e!s}", exc_info=True)
         state_store.set_failure(job_id, str(e))
         raise self.retry(exc=e, countdown=5) from e
 
     else:
         return result
 
-
-def create_processing_chain(content: str, job_id: str) -> Signature:
-    """Create task processing chain."""
-    return celery_chain(
-        parse_spec_task.s(content, job_id),
-        analyze_spec_task.s(),
-        generate_outputs_task.s(),
-    )
+    finally:
+        state_store.release_job_lock(job_id)
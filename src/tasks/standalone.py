@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from celery.canvas import Signature
+from celery import Task
 from celery.signals import task_failure, task_success
 
 from src.api.exceptions import BrokerError
@@ -33,10 +33,10 @@ def handle_failure(
         state_store.set_failure(args[0], str(exception))
 
 
-def verify_broker_connection(chain: Signature) -> None:
+def verify_broker_connection(task: Task) -> None:
     """Verify broker connection."""
     try:
-        connection = chain.app.connection()
+        connection = task.app.connection()
         connection.ensure_connection(max_retries=3, interval_start=1)
     except ConnectionError as e:
         raise BrokerError() from e
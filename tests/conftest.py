@@ -16,7 +16,7 @@ from redis.exceptions import ConnectionError
 from src.core.celery_app import celery_app
 from src.core.models import ProgressUpdate, TaskState, TaskStatus
 from src.core.state import state_store
-from src.core.storage import JobStorage
+from src.core.storage import JobStorage, job_storage
 from src.services.llm import EndpointAnalysis, SpecAnalysis
 
 SAMPLES_PATH = Path(__file__).parent / "samples"
@@ -40,6 +40,10 @@ def temp_job_data(monkeypatch: pytest.MonkeyPatch) -> None:
         temp_path = Path(temp_dir)
         # Patch before any imports or storage creation
         monkeypatch.setattr("src.core.storage.JOB_DATA_ROOT", temp_path)
+        monkeypatch.setattr(
+            "src.services.llm.COMPLETION_CACHE_DIR", temp_path / ".llm_cache"
+        )
+        job_storage.cache_clear()
         yield
 
 
@@ -61,8 +65,25 @@ def pytest_configure() -> None:
 def mock_redis() -> Mock:
     """Create a mock Redis instance for unit tests."""
     redis = Mock(spec=Redis)
-    redis.get.return_value = None  # Default to no state
-    redis.setex.return_value = True  # Default behavior for setting keys
+    redis.hgetall.return_value = {}  # Default to no state
+    redis.lrange.return_value = []  # Default to no progress
+
+    # Send pipelined commands to the mock's own methods
+    pipe = Mock(
+        hgetall=redis.hgetall,
+        lrange=redis.lrange,
+        hset=redis.hset,
+        hsetnx=redis.hsetnx,
+        hincrby=redis.hincrby,
+        rpush=redis.rpush,
+        expire=redis.expire,
+        delete=redis.delete,
+    )
+    pipe.execute.side_effect = lambda: [
+        redis.hgetall.return_value,
+        redis.lrange.return_value,
+    ]
+    redis.pipeline.return_value = pipe
     return redis
 
 
@@ -98,18 +119,16 @@ def assert_redis_state(
         key_prefix: Redis key prefix
     """
     if expected_state is None:
-        redis_client.setex.assert_not_called()
+        redis_client.hset.assert_not_called()
         return
 
-    assert redis_client.setex.call_count > 0, "Expected Redis setex to be called"
+    assert redis_client.hset.call_count > 0, "Expected Redis hset to be called"
     # Get the most recent call
-    last_call = redis_client.setex.call_args
-    key = f"{key_prefix}{expected_state.job_id}"
-    assert last_call[0][0] == key
-    saved_state = last_call[0][2]
-    assert isinstance(saved_state, str)
-    assert expected_state.state.value in saved_state
-    assert expected_state.job_id in saved_state
+    last_call = redis_client.hset.call_args
+    key = f"{key_prefix}{expected_state.job_id}:state"
+    assert last_call.args[0] == key
+    saved_fields = last_call.kwargs["mapping"]
+    assert saved_fields["state"] == expected_state.state.value
 
 
 @pytest.fixture
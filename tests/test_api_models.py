@@ -1,9 +1,11 @@
 import pytest
 from fastapi import HTTPException, UploadFile
 from fastapi import status as http_status
+from pydantic import ValidationError
 
 from src.api.models import SummaryResponse, validate_spec_file
 from src.core.models import TaskState
+from src.core.storage import SpecFormat
 
 
 def create_upload_file(filename: str, content_type: str) -> UploadFile:
@@ -18,7 +20,7 @@ def create_upload_file(filename: str, content_type: str) -> UploadFile:
 def test_validate_spec_file_json() -> None:
     """Test validation of JSON spec file."""
     file = create_upload_file("test.json", "application/json")
-    validate_spec_file(file)  # Should not raise
+    assert validate_spec_file(file) == SpecFormat.JSON
 
 
 def test_validate_spec_file_yaml() -> None:
@@ -30,7 +32,7 @@ def test_validate_spec_file_yaml() -> None:
     ]
     for content_type in yaml_types:
         file = create_upload_file("test.yaml", content_type)
-        validate_spec_file(file)  # Should not raise
+        assert validate_spec_file(file) == SpecFormat.YAML
 
 
 def test_validate_spec_file_invalid() -> None:
@@ -66,3 +68,10 @@ def test_summary_response_model() -> None:
     assert response.current_job_name == "test_job"
     assert response.current_job_progress == TEST_JOB_PROGRESS
     assert response.result == {"test": "data"}
+
+
+def test_summary_response_is_frozen() -> None:
+    """Test SummaryResponse can't be modified after creation."""
+    response = SummaryResponse(status=TaskState.STARTED)
+    with pytest.raises(ValidationError):
+        response.result = {"test": "data"}  # type: ignore[misc]
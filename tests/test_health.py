@@ -1,12 +1,18 @@
 """Tests for health check functionality."""
 
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
 
 import pytest
 from celery import Celery
 from redis.exceptions import ConnectionError, RedisError
 
-from src.core.health import check_celery_worker, check_redis_connection
+from src.core.config import redis_pool
+from src.core.health import (
+    WORKER_PING_TIMEOUT,
+    check_celery_worker,
+    check_redis_connection,
+    health_redis,
+)
 
 # Constants for test values
 ACTIVE_WORKERS = 10
@@ -15,10 +21,20 @@ RESERVED_TASKS = 3
 
 
 @pytest.fixture
-def mock_redis() -> Mock:
-    """Mock Redis client."""
+def mock_pipeline() -> Mock:
+    """Mock Redis pipeline."""
     mock = Mock()
-    mock.info.return_value = {"redis_version": "6.2.6"}
+    mock.ping.return_value = mock
+    mock.info.return_value = mock
+    mock.execute.return_value = [True, {"redis_version": "6.2.6"}]
+    return mock
+
+
+@pytest.fixture
+def mock_redis(mock_pipeline: Mock) -> MagicMock:
+    """Mock Redis client."""
+    mock = MagicMock()
+    mock.pipeline.return_value.__enter__.return_value = mock_pipeline
     return mock
 
 
@@ -31,7 +47,7 @@ def mock_celery_app() -> Mock:
     return mock
 
 
-def test_check_redis_connection_healthy(mock_redis: Mock) -> None:
+def test_check_redis_connection_healthy(mock_redis: Mock, mock_pipeline: Mock) -> None:
     """Test healthy Redis connection."""
     result = check_redis_connection(mock_redis)
     assert result.is_healthy
@@ -39,11 +55,12 @@ def test_check_redis_connection_healthy(mock_redis: Mock) -> None:
         "status": "healthy",
         "version": "6.2.6",
     }
+    mock_pipeline.info.assert_called_once_with("server")
 
 
-def test_check_redis_connection_error(mock_redis: Mock) -> None:
+def test_check_redis_connection_error(mock_redis: Mock, mock_pipeline: Mock) -> None:
     """Test Redis connection error."""
-    mock_redis.info.side_effect = ConnectionError("Connection refused")
+    mock_pipeline.execute.side_effect = ConnectionError("Connection refused")
     result = check_redis_connection(mock_redis)
     assert not result.is_healthy
     assert result.details == {
@@ -52,9 +69,9 @@ def test_check_redis_connection_error(mock_redis: Mock) -> None:
     }
 
 
-def test_check_redis_general_error(mock_redis: Mock) -> None:
+def test_check_redis_general_error(mock_redis: Mock, mock_pipeline: Mock) -> None:
     """Test Redis general error."""
-    mock_redis.info.side_effect = RedisError("Unknown error")
+    mock_pipeline.execute.side_effect = RedisError("Unknown error")
     result = check_redis_connection(mock_redis)
     assert not result.is_healthy
     assert result.details == {
@@ -63,13 +80,39 @@ def test_check_redis_general_error(mock_redis: Mock) -> None:
     }
 
 
+def test_check_redis_connection_uses_shared_pool() -> None:
+    """Test the default health check client uses the shared pool."""
+    assert health_redis.connection_pool is redis_pool
+
+
 def test_check_celery_worker_healthy(mock_celery_app: Mock) -> None:
     """Test healthy Celery worker."""
-    mock_celery_app.control.inspect.return_value.active.return_value = {
+    inspect = mock_celery_app.control.inspect.return_value
+    inspect.ping.return_value = {
+        "worker1": {"ok": "pong"},
+        "worker2": {"ok": "pong"},
+    }
+    result = check_celery_worker(mock_celery_app)
+    assert result.is_healthy
+    assert result.details == {
+        "status": "healthy",
+        "active_workers": 2,
+    }
+    inspect.active.assert_not_called()
+
+
+def test_check_celery_worker_include_tasks(mock_celery_app: Mock) -> None:
+    """Test Celery worker health with task counts."""
+    inspect = mock_celery_app.control.inspect.return_value
+    inspect.ping.return_value = {
+        "worker1": {"ok": "pong"},
+        "worker2": {"ok": "pong"},
+    }
+    inspect.active.return_value = {
         "worker1": [{"id": f"task{i}"} for i in range(ACTIVE_TASKS)],
         "worker2": [{"id": f"task{i}"} for i in range(RESERVED_TASKS)],
     }
-    result = check_celery_worker(mock_celery_app)
+    result = check_celery_worker(mock_celery_app, include_tasks=True)
     assert result.is_healthy
     assert result.details == {
         "status": "healthy",
@@ -78,9 +121,20 @@ def test_check_celery_worker_healthy(mock_celery_app: Mock) -> None:
     }
 
 
+def test_check_celery_worker_destinations(mock_celery_app: Mock) -> None:
+    """Test Celery worker health limited to known workers."""
+    inspect = mock_celery_app.control.inspect.return_value
+    inspect.ping.return_value = {"worker1": {"ok": "pong"}}
+    result = check_celery_worker(mock_celery_app, destinations=["worker1"])
+    assert result.is_healthy
+    mock_celery_app.control.inspect.assert_called_once_with(
+        destination=["worker1"], timeout=WORKER_PING_TIMEOUT
+    )
+
+
 def test_check_celery_worker_no_workers(mock_celery_app: Mock) -> None:
     """Test Celery worker with no active workers."""
-    mock_celery_app.control.inspect.return_value.active.return_value = None
+    mock_celery_app.control.inspect.return_value.ping.return_value = None
     result = check_celery_worker(mock_celery_app)
     assert not result.is_healthy
     assert result.details == {
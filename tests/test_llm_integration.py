@@ -1,5 +1,7 @@
 """Tests for LLM integration with OpenAPI specs."""
 
+import os
+from datetime import timedelta
 from pathlib import Path
 from unittest.mock import ANY, Mock, patch
 
@@ -9,7 +11,13 @@ from openai import APIError
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
 from openai.types.completion_usage import CompletionUsage
 
-from src.services.llm import LLMConfig, SpecAnalysis, get_llm_spec_analysis
+from src.services import llm
+from src.services.llm import (
+    LLMConfig,
+    SpecAnalysis,
+    delete_expired_completions,
+    get_llm_spec_analysis,
+)
 from src.services.parser import parse_openapi_spec
 
 SAMPLES_PATH = Path(__file__).parent / "samples"
@@ -163,6 +171,97 @@ def test_token_limit_handling() -> None:
         )
 
 
+def test_endpoint_analyses_keep_spec_order() -> None:
+    """Test concurrent endpoint completions are matched to their endpoints."""
+    spec = parse_openapi_spec((SAMPLES_PATH / "sample.yaml").read_text())
+
+    def complete(*, messages: list[dict[str, str]], **_: object) -> ChatCompletion:
+        return create_mock_chat_completion(messages[-1]["content"])
+
+    with patch("src.services.llm.client") as mock_client:
+        mock_client.chat.completions.create.side_effect = complete
+        result = get_llm_spec_analysis(spec)
+
+    assert [(e.path, e.method) for e in result.endpoints] == [
+        (e.path, e.method) for e in spec.endpoints
+    ]
+    assert all(e.path in e.analysis for e in result.endpoints)
+
+
+def test_duplicate_endpoint_prompts_share_completion() -> None:
+    """Test endpoints with identical prompts are only sent to the LLM once."""
+    spec = parse_openapi_spec((SAMPLES_PATH / "sample.yaml").read_text())
+    spec_analysis = {
+        "overview": "Overview prompt",
+        "endpoints": [
+            {"path": "/pets", "method": "GET", "analysis": "Shared prompt"},
+            {"path": "/users", "method": "GET", "analysis": "Shared prompt"},
+        ],
+    }
+
+    with (
+        patch("src.services.llm.client") as mock_client,
+        patch("src.services.llm.format_spec_for_analysis", return_value=spec_analysis),
+    ):
+        mock_client.chat.completions.create.side_effect = [
+            create_mock_chat_completion("Overview"),
+            create_mock_chat_completion("Shared analysis"),
+        ]
+        result = get_llm_spec_analysis(spec)
+
+    assert [e.path for e in result.endpoints] == ["/pets", "/users"]
+    assert {e.analysis for e in result.endpoints} == {"Shared analysis"}
+
+
+def test_completions_cached_on_disk() -> None:
+    """Test a repeated analysis is served from the completion cache."""
+    spec = parse_openapi_spec((SAMPLES_PATH / "sample.yaml").read_text())
+
+    with patch("src.services.llm.client") as mock_client:
+        mock_client.chat.completions.create.return_value = create_mock_chat_completion(
+            "Cached analysis"
+        )
+        first = get_llm_spec_analysis(spec)
+        mock_client.chat.completions.create.reset_mock()
+
+        assert get_llm_spec_analysis(spec) == first
+        mock_client.chat.completions.create.assert_not_called()
+
+        # A different config isn't served another config's completions
+        get_llm_spec_analysis(spec, config=LLMConfig(model="gpt-4"))
+        mock_client.chat.completions.create.assert_called()
+
+
+def test_delete_expired_completions() -> None:
+    """Test only cached completions past the max age are deleted."""
+    spec = parse_openapi_spec((SAMPLES_PATH / "sample.yaml").read_text())
+    with patch("src.services.llm.client") as mock_client:
+        mock_client.chat.completions.create.return_value = create_mock_chat_completion(
+            "Cached analysis"
+        )
+        get_llm_spec_analysis(spec)
+
+    expired, *current = sorted(llm.COMPLETION_CACHE_DIR.glob("*/*"))
+    os.utime(expired, (0, 0))
+    # A write in progress is left to its writer, however old
+    in_progress = expired.with_name(f"{expired.name}.partial.tmp")
+    in_progress.write_text("Partial")
+    os.utime(in_progress, (0, 0))
+
+    assert delete_expired_completions(timedelta(days=1)) == 1
+    assert not expired.exists()
+    assert in_progress.exists()
+    assert all(path.exists() for path in current)
+
+
+def test_delete_expired_completions_skips_vanished_files() -> None:
+    """Test entries removed while pruning the cache are skipped."""
+    vanished = llm.COMPLETION_CACHE_DIR / "ab" / "abcd"
+
+    with patch("src.services.llm.Path.glob", return_value=iter([vanished])):
+        assert delete_expired_completions(timedelta(days=1)) == 0
+
+
 @pytest.mark.parametrize(
     "error_type,error_msg",
     [
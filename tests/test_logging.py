@@ -0,0 +1,57 @@
+"""Tests for logging setup."""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+GREENLET_COUNT = 3
+LINES_PER_GREENLET = 3
+
+# Logs from greenlets after patching, as the Celery worker does
+GEVENT_LOGGING_SCRIPT = textwrap.dedent(
+    f"""
+    from gevent import monkey
+
+    monkey.patch_all()
+
+    from pathlib import Path
+
+    import gevent
+    from loguru import logger
+
+    from src.core.logging import LogConfig, setup_logging
+
+    setup_logging(LogConfig(log_dir=Path("logs")), enqueue=False)
+
+
+    def work(index):
+        for line in range({LINES_PER_GREENLET}):
+            logger.info("Greenlet {{}} line {{}}", index, line)
+            gevent.sleep(0.01)
+
+
+    gevent.joinall([gevent.spawn(work, i) for i in range({GREENLET_COUNT})])
+    """
+)
+
+
+class TestSetupLogging:
+    """Tests for setup_logging."""
+
+    def test_logging_from_greenlets_without_queue(self, tmp_path: Path) -> None:
+        """Test greenlets can log to the file sink after gevent patching."""
+        root = Path(__file__).parent.parent
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", GEVENT_LOGGING_SCRIPT],
+            cwd=tmp_path,
+            env={"PYTHONPATH": str(root)},
+            capture_output=True,
+            timeout=20,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr.decode()
+        (log_file,) = (tmp_path / "logs").glob("*.log")
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == GREENLET_COUNT * LINES_PER_GREENLET
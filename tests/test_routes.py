@@ -1,14 +1,22 @@
 """Tests for API routes."""
 
+import asyncio
+import io
+import time
+import zipfile
 from collections.abc import Generator
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from src.api.routes import SUCCESS_STATE_CACHE_TTL, get_job_context
+from src.core import storage as storage_module
+from src.core.health import HealthCheckResult
 from src.core.models import ProgressUpdate, TaskState, TaskStatus
-from src.core.storage import JobStorage, SpecFormat
+from src.core.storage import ExportFormat, JobStorage, SpecFormat
 from src.main import app
 from src.services.llm import EndpointAnalysis, SpecAnalysis
 from tests.conftest import TEST_TIMESTAMP, assert_file_exists_with_content
@@ -19,7 +27,11 @@ client = TestClient(app)
 @pytest.fixture(autouse=True)
 def mock_state_store() -> Generator[Mock, None, None]:
     """Mock the state store."""
-    with patch("src.api.routes.state_store") as mock:
+    with (
+        patch("src.api.routes.state_store") as mock,
+        patch.dict("src.api.routes._state_cache", clear=True),
+        patch.dict("src.api.routes._export_paths", clear=True),
+    ):
         yield mock
 
 
@@ -41,17 +53,56 @@ def mock_openai() -> Generator[Mock, None, None]:
 
 
 @pytest.fixture
-def mock_chain() -> Generator[Mock, None, None]:
-    """Mock Celery chain."""
-    with patch("src.api.routes.create_processing_chain") as mock:
-        chain = Mock()
+def mock_task() -> Generator[Mock, None, None]:
+    """Mock the Celery processing task."""
+    with patch("src.api.routes.process_spec_pipeline") as mock:
         result = Mock()
         result.id = "test-task-id"
-        chain.apply_async.return_value = result
-        mock.return_value = chain
+        mock.apply_async.return_value = result
         yield mock
 
 
+class TestHealthCheck:
+    """Tests for the health check endpoint."""
+
+    def test_health_check_is_cached(self: "TestHealthCheck") -> None:
+        """Test repeated health checks reuse the cached result."""
+        healthy = HealthCheckResult(is_healthy=True, details={"status": "healthy"})
+
+        with (
+            patch("src.api.routes._health_cache", None),
+            patch(
+                "src.api.routes.check_redis_connection", return_value=healthy
+            ) as mock_redis,
+            patch("src.api.routes.check_celery_worker", return_value=healthy),
+        ):
+            first = client.get("/api/health")
+            second = client.get("/api/health")
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.json() == first.json()
+        mock_redis.assert_called_once()
+
+    def test_health_checks_run_off_event_loop(self: "TestHealthCheck") -> None:
+        """Test the blocking dependency checks don't run on the event loop."""
+        healthy = HealthCheckResult(is_healthy=True, details={"status": "healthy"})
+
+        def check(*_: object) -> HealthCheckResult:
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return healthy
+
+        with (
+            patch("src.api.routes._health_cache", None),
+            patch("src.api.routes.check_redis_connection", side_effect=check),
+            patch("src.api.routes.check_celery_worker", side_effect=check) as celery,
+        ):
+            response = client.get("/api/health")
+
+        assert response.status_code == status.HTTP_200_OK
+        celery.assert_called_once()
+
+
 class TestSpecUpload:
     """Tests for spec upload endpoint."""
 
@@ -59,57 +110,65 @@ class TestSpecUpload:
         self: "TestSpecUpload",
         sample_spec: bytes,
         test_job_id: str,
-        mock_chain: Mock,
+        mock_task: Mock,
     ) -> None:
         """Test uploading a valid JSON OpenAPI spec"""
         # Create storage instance to ensure directory exists
         storage = JobStorage(test_job_id)
 
-        with patch("src.api.routes.uuid4") as mock_uuid:
-            mock_uuid.return_value = test_job_id
+        with patch("src.api.routes.new_job_id") as mock_job_id:
+            mock_job_id.return_value = test_job_id
 
             response = client.post(
                 "/api/spec/upload",
                 files={"file": ("test.json", sample_spec, "application/json")},
             )
             assert response.status_code == status.HTTP_200_OK
-            assert response.json() == {"job_id": test_job_id}
+            assert response.json() == {
+                "job_id": test_job_id,
+                "state_url": f"/api/spec/{test_job_id}/state",
+                "summary_url": f"/api/spec/{test_job_id}/summary",
+                "export_url": f"/api/spec/{test_job_id}/export",
+            }
 
             # Verify file was saved
             spec_path = storage.job_dir / "spec.json"
             assert_file_exists_with_content(spec_path, sample_spec)
 
-            # Verify chain was created with correct arguments
-            mock_chain.assert_called_once_with(sample_spec.decode("utf-8"), test_job_id)
-            mock_chain.return_value.apply_async.assert_called_once()
+            # Verify task was started with correct arguments
+            mock_task.apply_async.assert_called_once_with(args=[test_job_id])
 
     def test_upload_valid_yaml(
         self: "TestSpecUpload",
         sample_spec: bytes,
         test_job_id: str,
-        mock_chain: Mock,
+        mock_task: Mock,
     ) -> None:
         """Test uploading with YAML content type"""
         # Create storage instance to ensure directory exists
         storage = JobStorage(test_job_id)
 
-        with patch("src.api.routes.uuid4") as mock_uuid:
-            mock_uuid.return_value = test_job_id
+        with patch("src.api.routes.new_job_id") as mock_job_id:
+            mock_job_id.return_value = test_job_id
 
             response = client.post(
                 "/api/spec/upload",
                 files={"file": ("test.yaml", sample_spec, "text/yaml")},
             )
             assert response.status_code == status.HTTP_200_OK
-            assert response.json() == {"job_id": test_job_id}
+            assert response.json() == {
+                "job_id": test_job_id,
+                "state_url": f"/api/spec/{test_job_id}/state",
+                "summary_url": f"/api/spec/{test_job_id}/summary",
+                "export_url": f"/api/spec/{test_job_id}/export",
+            }
 
             # Verify file was saved
             spec_path = storage.job_dir / "spec.yaml"
             assert_file_exists_with_content(spec_path, sample_spec)
 
-            # Verify chain was created with correct arguments
-            mock_chain.assert_called_once_with(sample_spec.decode("utf-8"), test_job_id)
-            mock_chain.return_value.apply_async.assert_called_once()
+            # Verify task was started with correct arguments
+            mock_task.apply_async.assert_called_once_with(args=[test_job_id])
 
     def test_upload_invalid_content_type(
         self: "TestSpecUpload",
@@ -156,6 +215,18 @@ class TestSpecSummary:
         assert response.json()["status"] == "progress"
         assert response.json()["current_job_name"] == "test"
 
+    def test_get_summary_not_found(
+        self: "TestSpecSummary",
+        mock_state_store: Mock,
+        test_job_id: str,
+    ) -> None:
+        """Test polling an unknown job doesn't create its job directory."""
+        mock_state_store.get_state.return_value = None
+
+        response = client.get(f"/api/spec/{test_job_id}/summary")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not (storage_module.JOB_DATA_ROOT / test_job_id).exists()
+
     def test_get_failed_summary_from_state(
         self: "TestSpecSummary",
         mock_state_store: Mock,
@@ -209,15 +280,107 @@ class TestSpecState:
         assert response.status_code == status.HTTP_200_OK
         assert response.json()["status"] == "success"
 
+    def test_get_state_cached_while_polling(
+        self: "TestSpecState",
+        mock_state_store: Mock,
+        test_job_id: str,
+    ) -> None:
+        """Test repeated polls within the TTL reuse the cached state."""
+        mock_state_store.get_state.return_value = TaskStatus(
+            job_id=test_job_id,
+            state=TaskState.PROGRESS,
+        )
+
+        client.get(f"/api/spec/{test_job_id}/state")
+        response = client.get(f"/api/spec/{test_job_id}/state")
+
+        assert response.json()["status"] == "progress"
+        mock_state_store.get_state.assert_called_once_with(test_job_id)
+
+    def test_get_state_success_cache_expires(
+        self: "TestSpecState",
+        mock_state_store: Mock,
+        test_job_id: str,
+    ) -> None:
+        """Test a successful job's cached state is re-read after its TTL."""
+        mock_state_store.get_state.return_value = None
+        state = TaskStatus(job_id=test_job_id, state=TaskState.SUCCESS)
+
+        # Older than the polling TTL, but within the success TTL
+        fetched_at = time.monotonic() - SUCCESS_STATE_CACHE_TTL / 2
+        with patch.dict(
+            "src.api.routes._state_cache", {test_job_id: (fetched_at, state)}
+        ):
+            response = client.get(f"/api/spec/{test_job_id}/state")
+        assert response.status_code == status.HTTP_200_OK
+        mock_state_store.get_state.assert_not_called()
+
+        # The job has since expired from the state store
+        fetched_at = time.monotonic() - SUCCESS_STATE_CACHE_TTL
+        with patch.dict(
+            "src.api.routes._state_cache", {test_job_id: (fetched_at, state)}
+        ):
+            response = client.get(f"/api/spec/{test_job_id}/state")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_state_not_modified(
+        self: "TestSpecState",
+        mock_state_store: Mock,
+        test_job_id: str,
+    ) -> None:
+        """Test polling a finished job with its ETag returns 304."""
+        mock_state_store.get_state.return_value = TaskStatus(
+            job_id=test_job_id,
+            state=TaskState.SUCCESS,
+            result={"test": "result"},
+        )
+
+        response = client.get(f"/api/spec/{test_job_id}/state")
+        assert "immutable" in response.headers["cache-control"]
+
+        response = client.get(
+            f"/api/spec/{test_job_id}/state",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert not response.content
+
+    async def test_get_state_single_flight(
+        self: "TestSpecState",
+        mock_state_store: Mock,
+        test_job_id: str,
+    ) -> None:
+        """Test concurrent lookups for one job share a single read."""
+        mock_state_store.get_state.return_value = TaskStatus(
+            job_id=test_job_id,
+            state=TaskState.PROGRESS,
+        )
+
+        contexts = await asyncio.gather(
+            *(get_job_context(test_job_id) for _ in range(5))
+        )
+
+        assert all(context.state.state == TaskState.PROGRESS for context in contexts)
+        mock_state_store.get_state.assert_called_once_with(test_job_id)
+
 
 class TestSpecExport:
     """Tests for export endpoint."""
 
-    def test_export_nonexistent_job(self: "TestSpecExport", test_job_id: str) -> None:
-        """Test exporting a nonexistent job."""
-        response = client.get(f"/api/spec/{test_job_id}/export")
+    @pytest.mark.parametrize("endpoint", ["export", "export_all"])
+    def test_export_nonexistent_job(
+        self: "TestSpecExport",
+        mock_state_store: Mock,
+        test_job_id: str,
+        endpoint: str,
+    ) -> None:
+        """Test exporting an unknown job doesn't create storage for it."""
+        mock_state_store.get_state.return_value = None
+
+        response = client.get(f"/api/spec/{test_job_id}/{endpoint}")
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "Job not found" in response.json()["detail"]
+        assert not (storage_module.JOB_DATA_ROOT / test_job_id).exists()
 
     def test_export_no_summary(self: "TestSpecExport", test_job_id: str) -> None:
         """Test exporting when summary is not ready."""
@@ -229,6 +392,27 @@ class TestSpecExport:
         assert response.status_code == status.HTTP_202_ACCEPTED
         assert "Summary is not ready" in response.json()["detail"]
 
+    def test_export_stale_path_evicted_alone(
+        self: "TestSpecExport", test_job_id: str, tmp_path: Path
+    ) -> None:
+        """Test a deleted export only drops its own cached location."""
+        storage = JobStorage(test_job_id)
+        storage.save_spec("test spec", SpecFormat.JSON)
+        storage.save_summary({"test": "summary"})
+        other_key = ("other-job", ExportFormat.MARKDOWN)
+        other_path = tmp_path / "summary.md"
+
+        stale = {
+            (test_job_id, ExportFormat.MARKDOWN): tmp_path / "deleted.md",
+            other_key: other_path,
+        }
+        with patch.dict("src.api.routes._export_paths", stale) as cache:
+            response = client.get(f"/api/spec/{test_job_id}/export?file_format=md")
+
+            assert response.status_code == status.HTTP_200_OK
+            assert cache[test_job_id, ExportFormat.MARKDOWN].exists()
+            assert cache[other_key] == other_path
+
     def test_export_markdown(self: "TestSpecExport", test_job_id: str) -> None:
         """Test exporting as markdown."""
         # Create job directory and required files
@@ -266,3 +450,44 @@ class TestSpecExport:
             "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         )
         assert len(response.content) > 0  # Should have some content
+
+    def test_export_not_modified(self: "TestSpecExport", test_job_id: str) -> None:
+        """Test exporting with a matching ETag returns 304."""
+        storage = JobStorage(test_job_id)
+        storage.save_spec("test spec", SpecFormat.JSON)
+        storage.save_summary({"test": "summary"})
+
+        response = client.get(f"/api/spec/{test_job_id}/export?file_format=md")
+        etag = response.headers["etag"]
+
+        response = client.get(
+            f"/api/spec/{test_job_id}/export?file_format=md",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert not response.content
+
+    def test_export_all(self: "TestSpecExport", test_job_id: str) -> None:
+        """Test exporting several formats as one archive."""
+        storage = JobStorage(test_job_id)
+        storage.save_spec("test spec", SpecFormat.JSON)
+        storage.save_summary({"test": "summary"})
+
+        response = client.get(
+            f"/api/spec/{test_job_id}/export_all?formats=md&formats=html"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/zip"
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.namelist() == ["api_summary.md", "api_summary.html"]
+            assert "<h1>API Summary</h1>" in archive.read("api_summary.html").decode()
+
+    def test_export_all_no_summary(self: "TestSpecExport", test_job_id: str) -> None:
+        """Test exporting all formats when summary is not ready."""
+        storage = JobStorage(test_job_id)
+        storage.save_spec("test spec", SpecFormat.JSON)
+
+        response = client.get(f"/api/spec/{test_job_id}/export_all")
+        assert response.status_code == status.HTTP_202_ACCEPTED
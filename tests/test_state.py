@@ -1,5 +1,12 @@
 """Tests for task state management."""
 
+import json
+from datetime import datetime
+
+import orjson
+import pytest
+from pydantic import ValidationError
+
 from src.core.models import ProgressUpdate, TaskState, TaskStatus
 from src.core.state import state_store
 from tests.conftest import TEST_TIMESTAMP, assert_redis_state
@@ -10,12 +17,12 @@ class TestStateStore:
 
     def test_get_state_not_found(self, test_job_id: str) -> None:
         """Test getting state for non-existent job."""
-        state_store.redis.get.return_value = None
+        state_store.redis.hgetall.return_value = {}
         assert state_store.get_state(test_job_id) is None
 
-    def test_get_state_invalid_json(self, test_job_id: str) -> None:
-        """Test getting state with invalid JSON."""
-        state_store.redis.get.return_value = b"invalid json"
+    def test_get_state_invalid(self, test_job_id: str) -> None:
+        """Test getting state with invalid fields."""
+        state_store.redis.hgetall.return_value = {b"state": b"invalid"}
         assert state_store.get_state(test_job_id) is None
 
     def test_set_state(self, mock_state_info: TaskStatus) -> None:
@@ -27,9 +34,6 @@ class TestStateStore:
         self, test_job_id: str, mock_progress: ProgressUpdate
     ) -> None:
         """Test updating progress."""
-        # Initial state doesn't exist
-        state_store.redis.get.return_value = None
-
         state_store.update_progress(
             job_id=test_job_id,
             stage=mock_progress.stage,
@@ -37,14 +41,38 @@ class TestStateStore:
             message=mock_progress.message,
         )
 
-        # Verify state was created and saved
-        state_store.redis.setex.assert_called_once()
-        saved_state = state_store.redis.setex.call_args[0][2]
-        assert isinstance(saved_state, str)
-        assert TaskState.PROGRESS.value in saved_state
-        assert mock_progress.stage in saved_state
-        assert str(mock_progress.progress) in saved_state
-        assert mock_progress.message in saved_state
+        # Verify the state was updated without reading it
+        state_store.redis.hgetall.assert_not_called()
+        state_store.redis.hset.assert_called_once()
+        saved_fields = state_store.redis.hset.call_args.kwargs["mapping"]
+        assert saved_fields["state"] == TaskState.PROGRESS.value
+
+        # Verify the update was appended to the progress list
+        state_store.redis.rpush.assert_called_once()
+        key, saved_progress = state_store.redis.rpush.call_args[0]
+        assert key == f"job:{test_job_id}:progress"
+        assert mock_progress.stage in saved_progress
+        assert str(mock_progress.progress) in saved_progress
+        assert mock_progress.message in saved_progress
+
+    def test_get_state_with_progress(
+        self, mock_state_info: TaskStatus, mock_progress: ProgressUpdate
+    ) -> None:
+        """Test getting state combines the job's hash and progress list."""
+        state_store.redis.hgetall.return_value = {
+            b"job_id": mock_state_info.job_id.encode(),
+            b"state": mock_state_info.state.value.encode(),
+            b"created_at": mock_state_info.created_at.isoformat().encode(),
+            b"updated_at": mock_state_info.updated_at.isoformat().encode(),
+            b"result": orjson.dumps(mock_state_info.result),
+            b"retries": b"0",
+        }
+        state_store.redis.lrange.return_value = [mock_progress.model_dump_json()]
+
+        state = state_store.get_state(mock_state_info.job_id)
+        assert state is not None
+        assert state.progress == [mock_progress]
+        assert state.model_copy(update={"progress": []}) == mock_state_info
 
     def test_set_success(self, test_job_id: str) -> None:
         """Test setting success state."""
@@ -60,6 +88,24 @@ class TestStateStore:
         )
         assert_redis_state(state_store.redis, expected_state)
 
+    def test_large_result_compressed(self, test_job_id: str) -> None:
+        """Test large results are stored compressed and read back."""
+        result = {"endpoints": [{"path": f"/items/{i}"} for i in range(100)]}
+        state_store.set_success(test_job_id, result)
+
+        fields = state_store.redis.hset.call_args.kwargs["mapping"]
+        assert len(fields["result"]) < len(orjson.dumps(result))
+
+        state_store.redis.hgetall.return_value = {
+            b"job_id": test_job_id.encode(),
+            b"state": fields["state"].encode(),
+            b"created_at": fields["updated_at"].encode(),
+            b"result": fields["result"],
+        }
+        state = state_store.get_state(test_job_id)
+        assert state is not None
+        assert state.result == result
+
     def test_set_failure(self, test_job_id: str) -> None:
         """Test setting failure state."""
         error = "Test error"
@@ -76,16 +122,6 @@ class TestStateStore:
 
     def test_set_retry(self, test_job_id: str) -> None:
         """Test setting retry state."""
-        # Set up existing state with retries
-        existing_state = TaskStatus(
-            job_id=test_job_id,
-            state=TaskState.FAILURE,
-            retries=1,
-            created_at=TEST_TIMESTAMP,
-            updated_at=TEST_TIMESTAMP,
-        )
-        state_store.redis.get.return_value = existing_state.model_dump_json()
-
         error = "Test error"
         state_store.set_retry(test_job_id, error)
 
@@ -93,11 +129,13 @@ class TestStateStore:
             job_id=test_job_id,
             state=TaskState.FAILURE,
             error=error,
-            retries=2,  # Incremented
             created_at=TEST_TIMESTAMP,
             updated_at=TEST_TIMESTAMP,
         )
         assert_redis_state(state_store.redis, expected_state)
+        state_store.redis.hincrby.assert_called_once_with(
+            f"job:{test_job_id}:state", "retries", 1
+        )
 
     def test_state_persistence(self, test_job_id: str) -> None:
         """Test full state persistence flow."""
@@ -144,3 +182,46 @@ class TestStateStore:
             updated_at=TEST_TIMESTAMP,
         )
         assert_redis_state(state_store.redis, expected_success)
+
+
+def test_progress_response_data_not_serialized(mock_progress: ProgressUpdate) -> None:
+    """Test the cached response dict doesn't leak into stored progress."""
+    assert mock_progress.response_data["percentage"] == mock_progress.progress
+    assert "response_data" not in mock_progress.model_dump()
+
+
+def test_progress_shares_update_timestamp(test_job_id: str) -> None:
+    """Test a new status and its progress share one timestamp."""
+    status = TaskStatus(job_id=test_job_id, state=TaskState.STARTED)
+    assert status.updated_at == status.created_at
+
+    status.update_progress("parsing", 50.0)
+    assert status.progress[-1].timestamp == status.updated_at
+
+
+def test_stage_progress_uses_latest_update(test_job_id: str) -> None:
+    """Test progress by stage reports each stage's latest update."""
+    status = TaskStatus(job_id=test_job_id, state=TaskState.PROGRESS)
+    status.update_progress("parsing", 50.0)
+    status.update_progress("analysis", 10.0)
+    status.update_progress("parsing", 100.0)
+
+    assert status.stage_progress == {"parsing": 100.0, "analysis": 10.0}
+    assert status.progress_stages == ["parsing", "analysis"]
+
+
+def test_state_json_round_trip(mock_state_info: TaskStatus) -> None:
+    """Test task state survives a JSON round trip with ISO timestamps."""
+    mock_state_info.update_progress("parsing", 50.0, "Parsing spec")
+    data = mock_state_info.model_dump_json()
+
+    timestamp = json.loads(data)["progress"][-1]["timestamp"]
+    assert datetime.fromisoformat(timestamp) == mock_state_info.progress[-1].timestamp
+    assert TaskStatus.model_validate_json(data) == mock_state_info
+
+
+def test_progress_update_is_frozen(mock_progress: ProgressUpdate) -> None:
+    """Test progress updates can't be modified once created."""
+    with pytest.raises(ValidationError):
+        mock_progress.stage = "other"  # type: ignore[misc]
+    assert mock_progress.iso_timestamp in str(mock_progress)
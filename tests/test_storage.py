@@ -1,10 +1,22 @@
 """Tests for storage functionality."""
 
+import io
 import json
+from datetime import timedelta
+from unittest.mock import patch
 
 import pytest
 
-from src.core.storage import JobStorage
+from src.core.storage import (
+    ExportFormat,
+    JobStorage,
+    SpecFormat,
+    delete_expired_jobs,
+    new_job_id,
+)
+from tests.conftest import TEST_TIMESTAMP
+
+ULID_LENGTH = 26
 
 
 @pytest.fixture
@@ -28,6 +40,14 @@ class TestJobStorage:
         saved_content = json.loads(path.read_text())
         assert saved_content == parsed_spec
 
+    def test_save_summary(self, job_storage: JobStorage) -> None:
+        """Test a saved summary round-trips through json.loads."""
+        summary = {"title": "Test API", "endpoints": [{"path": "/pets", "ok": True}]}
+
+        path = job_storage.save_summary(summary)
+        assert path.name == "summary.json"
+        assert json.loads(path.read_text()) == summary
+
     def test_get_parsed_spec_path_exists(self, job_storage: JobStorage) -> None:
         """Test getting path to existing parsed spec."""
         # Create a parsed spec file
@@ -39,7 +59,101 @@ class TestJobStorage:
         assert path.exists()
         assert path.name == "parsed_spec.json"
 
+    def test_save_spec_file(self, job_storage: JobStorage) -> None:
+        """Test streaming an uploaded spec to disk."""
+        content = b"openapi: 3.0.0\ninfo:\n  title: Test API\n"
+
+        path = job_storage.save_spec_file(io.BytesIO(content), SpecFormat.YAML)
+
+        assert path.name == "spec.yaml"
+        assert path.read_bytes() == content
+        assert job_storage.get_spec_path() == path
+
+    def test_get_spec_path_remembers_extension(self, job_storage: JobStorage) -> None:
+        """Test the spec's extension is only probed for once per instance."""
+        path = job_storage.save_spec("{}", SpecFormat.JSON)
+        storage = JobStorage(job_storage.job_id)
+        assert storage.get_spec_path() == path
+
+        with patch("src.core.storage.Path.exists", return_value=True) as mock_exists:
+            assert storage.get_spec_path() == path
+        mock_exists.assert_called_once()
+
+    def test_job_dir_created_once(self, job_storage: JobStorage) -> None:
+        """Test a job's directory setup isn't repeated in the same process."""
+        with patch("src.core.storage.Path.mkdir") as mock_mkdir:
+            storage = JobStorage(job_storage.job_id)
+
+        mock_mkdir.assert_not_called()
+        assert storage.job_dir == job_storage.job_dir
+
+    def test_ensure_export_exists_uses_format_extension(
+        self, job_storage: JobStorage
+    ) -> None:
+        """Test placeholder exports are named by format value and non-empty."""
+        for format_ in ExportFormat:
+            path = job_storage.ensure_export_exists(format_)
+            assert path.name == f"summary.{format_.value}"
+            assert path.stat().st_size > 0
+
+    def test_failed_save_keeps_previous_file(self, job_storage: JobStorage) -> None:
+        """Test an interrupted save leaves the existing file and no temp files."""
+        path = job_storage.save_spec("openapi: 3.0.0\n", SpecFormat.YAML)
+        source = io.BytesIO(b"openapi: 3.1.0\n")
+
+        with (
+            patch.object(source, "read", side_effect=OSError("Disk error")),
+            pytest.raises(OSError, match="Disk error"),
+        ):
+            job_storage.save_spec_file(source, SpecFormat.YAML)
+
+        assert path.read_text() == "openapi: 3.0.0\n"
+        assert not list(job_storage.job_dir.glob("*.tmp"))
+
+    def test_log_event_appends_lines(self, job_storage: JobStorage) -> None:
+        """Test events are appended to the execution log one line each."""
+        job_storage.log_event("First")
+        job_storage.log_event("Second")
+
+        lines = job_storage.log_file.read_text().splitlines()
+        assert lines[-2].endswith("] First")
+        assert lines[-1].endswith("] Second")
+
+    def test_ensure_export_exists_keeps_existing(self, job_storage: JobStorage) -> None:
+        """Test an existing export isn't overwritten by the placeholder."""
+        job_storage.save_export("# Real summary", ExportFormat.MARKDOWN)
+
+        path = job_storage.ensure_export_exists(ExportFormat.MARKDOWN)
+        assert path.read_text() == "# Real summary"
+
     def test_get_parsed_spec_path_not_exists(self, job_storage: JobStorage) -> None:
         """Test getting path to non-existent parsed spec."""
         path = job_storage.get_parsed_spec_path()
         assert path is None
+
+
+class TestJobIds:
+    """Tests for job ID generation and expiry."""
+
+    def test_new_job_id_is_time_ordered(self) -> None:
+        """Test job IDs are ULIDs that sort by creation time."""
+        with patch("src.core.storage.datetime") as mock_datetime:
+            mock_datetime.now.return_value = TEST_TIMESTAMP
+            older = new_job_id()
+        newer = new_job_id()
+
+        assert len(older) == ULID_LENGTH
+        assert older < newer
+
+    def test_delete_expired_jobs(self) -> None:
+        """Test only job directories past the max age are deleted."""
+        with patch("src.core.storage.datetime") as mock_datetime:
+            mock_datetime.now.return_value = TEST_TIMESTAMP
+            expired = JobStorage(new_job_id())
+        current = JobStorage(new_job_id())
+        legacy = JobStorage("8c5a8d47-9b3e-4b8e-a1a5-6f2c3f8d9e10")
+
+        assert delete_expired_jobs(timedelta(days=1)) == 1
+        assert not expired.job_dir.exists()
+        assert current.job_dir.exists()
+        assert legacy.job_dir.exists()
@@ -1,16 +1,19 @@
 """Tests for background tasks."""
 
-import json
 from collections.abc import Generator
+from unittest.mock import patch
 
 import pytest
 from redis import Redis
 
-from src.core.config import settings
 from src.core.models import TaskState
 from src.core.state import state_store
+from src.core.storage import JobStorage, SpecFormat
 from src.services.parser import ParsedSpec
+from src.tasks.maintenance import cleanup_expired_jobs
+from src.tasks.pipeline import process_spec_pipeline
 from src.tasks.standalone import handle_success
+from tests.conftest import SAMPLES_PATH
 
 
 @pytest.fixture(autouse=True)
@@ -58,6 +61,33 @@ def cached_spec() -> dict:
     }
 
 
+class TestProcessSpecPipeline:
+    """Tests for process_spec_pipeline."""
+
+    def test_pipeline_runs_all_stages(self, test_job_id: str) -> None:
+        """Test the pipeline parses, analyzes and exports in one task."""
+        content = (SAMPLES_PATH / "sample.yaml").read_text()
+        JobStorage(test_job_id).save_spec(content, SpecFormat.YAML)
+
+        process_spec_pipeline.apply(args=[test_job_id]).get()
+
+        state = state_store.get_state(test_job_id)
+        assert state is not None
+        assert state.state == TaskState.SUCCESS
+        assert state.result is not None
+        assert state.result["analysis"]["spec_info"]["title"] == "Test API"
+        assert {"parsing", "analysis", "export"} <= set(state.progress_stages)
+        assert state_store.acquire_job_lock(test_job_id)  # Lock was released
+
+    def test_pipeline_skips_locked_job(self, test_job_id: str) -> None:
+        """Test a duplicate task doesn't run while the job is locked."""
+        assert state_store.acquire_job_lock(test_job_id)
+
+        process_spec_pipeline.apply(args=[test_job_id]).get()
+
+        assert state_store.get_state(test_job_id) is None
+
+
 class TestAnalyzeAPITask:
     """Tests for analyze_api_task."""
 
@@ -71,11 +101,22 @@ class TestAnalyzeAPITask:
         handle_success(result=result)
 
         # Verify state was saved in Redis
-        redis = Redis.from_url(settings.REDIS_URL)
-        key = f"job:{test_job_id}"
-        saved_state = redis.get(key)
+        saved_state = state_store.get_state(test_job_id)
         assert saved_state is not None
-
-        state_data = json.loads(saved_state)
-        assert state_data["state"] == TaskState.SUCCESS.value
-        assert state_data["result"] == result
+        assert saved_state.state == TaskState.SUCCESS
+        assert saved_state.result == result
+
+
+class TestCleanupExpiredJobs:
+    """Tests for cleanup_expired_jobs task."""
+
+    def test_job_cleanup_survives_completion_cleanup_failure(self) -> None:
+        """Test expired jobs are deleted even if pruning completions fails."""
+        with (
+            patch("src.tasks.maintenance.delete_expired_jobs", return_value=1) as jobs,
+            patch(
+                "src.tasks.maintenance.delete_expired_completions",
+                side_effect=OSError("Disk error"),
+            ),
+        ):
+            assert cleanup_expired_jobs() == jobs.return_value